@@ -0,0 +1,57 @@
+import dataclasses
+import json
+from collections.abc import Callable
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+try:
+    import orjson  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _default(obj: Any) -> Any:
+    """Encode values which json does not support natively, most common types are checked first"""
+    if isinstance(obj, datetime):
+        return obj.strftime(DATETIME_FORMAT)
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Decimal):
+        # same as fastapi, integral decimals are sent as ints
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)  # type: ignore[operator]
+    if isinstance(obj, date | time):
+        return obj.isoformat()
+    if isinstance(obj, timedelta):
+        return obj.total_seconds()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, set | frozenset | tuple):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+
+    # anything else (pydantic models, paths, ...) goes through the generic encoder
+    from fastapi.encoders import jsonable_encoder
+
+    return jsonable_encoder(obj, custom_encoder={datetime: lambda dt: dt.strftime(DATETIME_FORMAT)})
+
+
+def _dumps_json(obj: Any) -> bytes:
+    # same output format as starlette JSONResponse
+    return json.dumps(obj, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def _dumps_orjson(obj: Any) -> bytes:
+    # datetimes are passed through to keep the format used by the UI
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS)
+
+
+encode_json: Callable[[Any], bytes] = _dumps_orjson if orjson is not None else _dumps_json
+"""Encode response body to JSON bytes in a single pass, uses orjson when installed"""
@@ -1,23 +1,31 @@
 import asyncio
 import dataclasses
 import datetime
+import functools
 import logging
+import operator
 import os.path
 import string
 import sys
-from collections.abc import Awaitable, Callable, Iterable, Sequence
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping, Sequence
 from contextvars import ContextVar
 from inspect import Parameter, signature
+from types import MappingProxyType
 from typing import Any, Literal, Protocol, TypedDict, cast
 from urllib.parse import quote, unquote
 
 from sqlalchemy.orm import InstrumentedAttribute
 from starlette.datastructures import ImmutableMultiDict
 
+from ._json import encode_json
+from .assets import AssetStore, accepts_encoding
 from .auth import AuthException, AuthProviderBase, InvalidCredentialsException, MissingOTPException
 from .config import (
     AdminTableConfig,
     CapabilitiesMixin,
+    Computed,
+    ComputedBatch,
     CreateView,
     DetailView,
     GetGraphCallback,
@@ -25,6 +33,7 @@ from .config import (
     LinkDetail,
     LinkTable,
     ListView,
+    LiveDataManagerBase,
     LiveValue,
     Page,
     RedirectCustomPage,
@@ -32,8 +41,17 @@ from .config import (
     RedirectList,
     RefreshView,
     Resource,
+    SharedLiveDataManagerBase,
+)
+from .live_data import (
+    LiveDataCoalescer,
+    LiveDataHistory,
+    LiveDataProducerStats,
+    LiveDataSubscriber,
+    LiveDataTopicStats,
 )
 from .modules.bases import ResolverBase
+from .shared_live_data import SharedLiveDataDispatcher
 
 # Create context variable for current user
 current_user: ContextVar[AuthProviderBase.AuthorizedUserInfo | None] = ContextVar("current_user", default=None)
@@ -69,6 +87,9 @@ class AdminTableWebsocket:
         accept: Callable[[], Awaitable[None]]
         receive_json: Callable[[], Awaitable[dict[str, str]]]
         send_json: Callable[[dict[str, str]], Awaitable[None]]
+        # raw frames, used to send one already encoded message to many clients
+        send_text: Callable[[str], Awaitable[None]]
+        send_bytes: Callable[[bytes], Awaitable[None]]
         close: _WebsocketClose
 
     path: str
@@ -98,7 +119,8 @@ class AdminTableRoute:
     @dataclasses.dataclass
     class RouteResponse:
         status_code: int = 200
-        body: dict | str = dataclasses.field(default_factory=lambda: {})
+        # bytes are sent as they are, handlers can use them to return pre-encoded json
+        body: dict | str | bytes = dataclasses.field(default_factory=lambda: {})
         headers: dict = dataclasses.field(default_factory=lambda: {})
         cookies: Sequence[dict] = dataclasses.field(default_factory=lambda: [])
         content_type: str | None = None
@@ -113,14 +135,26 @@ class AdminTableRoute:
 
 class _HasConfig:
     config: AdminTableConfig
+    _registry: "_ViewRegistry"
 
     def __init__(self, config: AdminTableConfig):
         self.config = config
+        # configuration is compiled once, invalid configuration fails here instead of at request time
+        self._registry = _ViewRegistry.compile(config)
+
+    def invalidate(self) -> None:
+        """
+        Compile the configuration again, call after the configuration was changed at runtime.
+        Drops everything derived from the previous configuration, including resolver plans and cached responses.
+        """
+        for resource in self._registry.resources.values():
+            resource.resolver.invalidate(resource)
+        self._registry = _ViewRegistry.compile(self.config)
 
     def get_resource(self, resource_name: str) -> "Resource":
-        resource = next((resource for resource in self.config.resources or [] if resource.name == resource_name), None)
+        resource = self._registry.resources.get(resource_name)
         if resource is None:
-            raise ValueError(f"Resource not found: {resource}")
+            raise ValueError(f"Resource not found: {resource_name}")
         return resource
 
     @staticmethod
@@ -142,7 +176,7 @@ class _HasConfig:
         return view
 
     def get_input_form(self, location_name: str) -> "InputForm":
-        input_form = next((form for form in self.config.input_forms if form.location == location_name), None)
+        input_form = self._registry.input_forms.get(location_name)
         if input_form is None:
             raise ValueError(f"Input Form not found: {location_name}")
         return input_form
@@ -150,7 +184,7 @@ class _HasConfig:
     def get_page(self, page_name: str) -> "Page":
         unquoted = unquote(page_name)
 
-        page = next((p for p in self.config.pages if p.name == unquoted), None)
+        page = self._registry.pages.get(unquoted)
         if page is None:
             raise ValueError("Page not found, invalid page name")
         return page
@@ -316,18 +350,32 @@ class AuthRouteMixin(_HasConfig):
 
 
 class _Column:
+    # True when the value has to be awaited, such columns are computed for the whole page at once
+    is_async = False
+
     def __init__(self, *, ref: str, display: str, sortable: bool, description: str | None = None, **kwargs):
         self.ref = ref
         self.display = display
         self.sortable = sortable
         self.description = description
 
-    async def value(self, row):
+        # refs which have to be resolved to compute the value, None when the column needs the full row
+        self.refs: frozenset[str] | None = frozenset({ref} if ref else ())
+
+    def encode(self, row):
         # we do not perform check on purpose here, to let the application die
         # in case of programming error, that should be more noticable than screaming
         # errors into the command line
         return row[self.ref]
 
+    async def value(self, row):
+        return self.encode(row)
+
+    async def values(self, rows: Sequence[Any], limiter: asyncio.Semaphore) -> list[Any]:
+        """Values of the column for all rows on the page, `limiter` bounds concurrent awaits of async handlers"""
+        encode = self.encode
+        return [encode(row) for row in rows]
+
     async def head(self, current_sort: tuple[str, Literal["asc", "desc"]] | None = None):
         sort = None
         if current_sort:
@@ -346,15 +394,18 @@ class _LinkDetailColumn(_Column):
         super().__init__(**kwargs)
         self.resource = resource
         self.id_ref = id_ref
+        self.refs = frozenset({*(self.refs or ()), id_ref})
+        self.href_prefix = f"/resource/{quote(self.resource)}/detail/"
 
-    async def value(self, row):
+    def encode(self, row):
+        entity_id = row[self.id_ref]
         return {
             "type": "link",
             "kind": "detail",
             "resource": self.resource,
-            "value": await super().value(row),
-            "id": row[self.id_ref],
-            "href": f"/resource/{quote(self.resource)}/detail/{row[self.id_ref]}",
+            "value": row[self.ref],
+            "id": entity_id,
+            "href": f"{self.href_prefix}{entity_id}",
         }
 
 
@@ -365,35 +416,88 @@ class _LinkTableColumn(_Column):
         self.filter_col = filter_col
         self.filter_op = filter_op
         self.filter_ref = filter_ref
+        self.refs = frozenset({*(self.refs or ()), filter_ref})
+        self.href_prefix = f"/resource/{quote(self.resource)}/list?filter={self.filter_col};{self.filter_op};"
 
-    async def value(self, row):
+    def encode(self, row):
+        filter_val = row[self.filter_ref]
         return {
             "type": "link",
             "kind": "table",
             "resource": self.resource,
-            "value": await super().value(row),
-            "filter": {"col": self.filter_col, "op": self.filter_op, "val": row[self.filter_ref]},
-            "href": f"/resource/{quote(self.resource)}/list"
-            f"?filter={self.filter_col};{self.filter_op};{row[self.filter_ref]}",
+            "value": row[self.ref],
+            "filter": {"col": self.filter_col, "op": self.filter_op, "val": filter_val},
+            "href": f"{self.href_prefix}{filter_val}",
         }
 
 
 class _ComputedColumn(_Column):
-    def __init__(self, handler: Callable[[Any], str | Any | Awaitable[str | Any]], **kwargs):
+    def __init__(
+        self, handler: Callable[[Any], str | Any | Awaitable[str | Any]], refs: Sequence[str] | None = None, **kwargs
+    ):
         super().__init__(**kwargs)
         self.handler = handler
+        self.refs = frozenset(refs) if refs is not None else None
+        self.is_async = asyncio.iscoroutinefunction(handler)
+
+    def encode(self, row):
+        try:
+            return self.handler(row)
+        except Exception as e:
+            print(f"Failed computing {self}: {e}", file=sys.stderr)
+            return "# ERROR #"
 
     async def value(self, row):
+        if not self.is_async:
+            return self.encode(row)
+
+        try:
+            return await cast(Awaitable[Any], self.handler(row))
+        except Exception as e:
+            print(f"Failed computing {self}: {e}", file=sys.stderr)
+            return "# ERROR #"
+
+    async def values(self, rows: Sequence[Any], limiter: asyncio.Semaphore) -> list[Any]:
+        if not self.is_async:
+            return await super().values(rows, limiter)
+
+        async def limited_value(row):
+            async with limiter:
+                return await self.value(row)
+
+        return list(await asyncio.gather(*(limited_value(row) for row in rows)))
+
+
+class _ComputedBatchColumn(_Column):
+    is_async = True
+
+    def __init__(
+        self,
+        handler: Callable[[Sequence[Any]], Sequence[Any] | Awaitable[Sequence[Any]]],
+        refs: Sequence[str] | None = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.handler = handler
+        self.refs = frozenset(refs) if refs is not None else None
+
+    async def value(self, row):
+        return (await self.values([row], asyncio.Semaphore()))[0]
+
+    async def values(self, rows: Sequence[Any], limiter: asyncio.Semaphore) -> list[Any]:
         try:
             if asyncio.iscoroutinefunction(self.handler):
-                value = await self.handler(row)
+                async with limiter:
+                    values = list(await self.handler(rows))
             else:
-                value = self.handler(row)
+                values = list(cast(Sequence[Any], self.handler(rows)))
+            if len(values) != len(rows):
+                raise ValueError(f"returned {len(values)} values for {len(rows)} rows")
         except Exception as e:
             print(f"Failed computing {self}: {e}", file=sys.stderr)
-            value = "# ERROR #"
+            values = ["# ERROR #"] * len(rows)
 
-        return value
+        return values
 
 
 class _LiveValueColumn(_Column):
@@ -402,8 +506,9 @@ class _LiveValueColumn(_Column):
         self.topic_ref = topic_ref
         self.history = history
         super().__init__(**kwargs)
+        self.refs = frozenset({topic_ref, *([initial_value_ref] if initial_value_ref else [])})
 
-    async def value(self, row):
+    def encode(self, row):
         return {
             "type": "live",
             "initial": row[self.initial_value_ref] if self.initial_value_ref else None,
@@ -412,6 +517,44 @@ class _LiveValueColumn(_Column):
         }
 
 
+class _ListEncoder:
+    """
+    Header of a list view compiled into a row encoder.
+    Sync columns are encoded row by row without awaiting, async columns are computed for the whole page at once.
+    """
+
+    def __init__(self, header: Sequence[_Column]):
+        self.header = header
+
+        # resolve only refs which are displayed, unless some column needs the full row
+        column_refs = [h.refs for h in header]
+        self.refs = None if None in column_refs else set[str]().union(*filter(None, column_refs))
+
+        # plain columns are read with itemgetter to skip the python-level method call
+        self.__encoders: list[Callable[[Any], Any]] = []
+        for h in header:
+            if h.is_async:
+                continue
+            if type(h) is _Column:
+                self.__encoders.append(operator.itemgetter(h.ref))
+            else:
+                self.__encoders.append(h.encode)
+        self.__async_columns = [(i, h) for i, h in enumerate(header) if h.is_async]
+
+    async def encode(self, rows: Sequence[Any], limiter: asyncio.Semaphore) -> list[list[Any]]:
+        encoders = self.__encoders
+        encoded = [[encode(row) for encode in encoders] for row in rows]
+        if not self.__async_columns:
+            return encoded
+
+        columns = await asyncio.gather(*(h.values(rows, limiter) for _, h in self.__async_columns))
+        # async columns are inserted in ascending order of their position, so each lands on its final index
+        for (index, _), values in zip(self.__async_columns, columns):
+            for encoded_row, value in zip(encoded, values):
+                encoded_row.insert(index, value)
+        return encoded
+
+
 def field_resolver(fields) -> Iterable[_Column]:
     for field in fields:
         # pattern match on the field type
@@ -420,16 +563,18 @@ def field_resolver(fields) -> Iterable[_Column]:
             # field is string
             case ref if isinstance(ref, str):
                 yield _Column(display=ref, ref=ref, sortable=True)
-                # TODO check if ref is a valid column in the model
             case ref if isinstance(ref, InstrumentedAttribute):
                 yield _Column(display=ref.key, ref=ref.key, sortable=True)
             case [display, ref] if isinstance(ref, str):
-                # TODO check if ref is a valid column in the model
                 yield _Column(ref=ref, display=display, sortable=True)
             case [display, ref] if isinstance(ref, InstrumentedAttribute):
                 yield _Column(ref=ref.key, display=display, sortable=True)
             case [display, handler] if callable(handler):
                 yield _ComputedColumn(handler, ref=None, display=display, sortable=False)
+            case [display, ref] if isinstance(ref, Computed):
+                yield _ComputedColumn(ref.handler, ref.refs, ref=None, display=display, sortable=False)
+            case [display, ref] if isinstance(ref, ComputedBatch):
+                yield _ComputedBatchColumn(ref.handler, ref.refs, ref=None, display=display, sortable=False)
             case [display, ref] if isinstance(ref, LinkDetail):
                 yield _LinkDetailColumn(ref.resource, ref.id_ref, ref=ref.ref, display=display, sortable=True)
             case [display, ref] if isinstance(ref, LinkTable):
@@ -456,7 +601,15 @@ def field_resolver(fields) -> Iterable[_Column]:
             case [display, description, ref] if isinstance(ref, InstrumentedAttribute):
                 yield _Column(display=display, ref=ref.key, sortable=True, description=description)
             case [display, description, handler] if callable(handler):
-                yield _ComputedColumn(ref, ref=None, display=display, sortable=False, description=description)
+                yield _ComputedColumn(handler, ref=None, display=display, sortable=False, description=description)
+            case [display, description, ref] if isinstance(ref, Computed):
+                yield _ComputedColumn(
+                    ref.handler, ref.refs, ref=None, display=display, sortable=False, description=description
+                )
+            case [display, description, ref] if isinstance(ref, ComputedBatch):
+                yield _ComputedBatchColumn(
+                    ref.handler, ref.refs, ref=None, display=display, sortable=False, description=description
+                )
             case [display, description, ref] if isinstance(ref, LinkDetail):
                 yield _LinkDetailColumn(
                     ref.resource, ref.id_ref, ref=ref.ref, display=display, sortable=True, description=description
@@ -489,6 +642,181 @@ def field_resolver(fields) -> Iterable[_Column]:
                 raise ValueError(f"Invalid field definition: {field}")
 
 
+def _action_parameters(action: Callable[..., Any]) -> list[dict[str, Any]]:
+    """Parameters of the action displayed in the UI, parsed from its signature and Annotated metadata"""
+    type_map = {int: "int", str: "str", Parameter.empty: "str", bool: "bool"}
+
+    parameters = []
+    for attr, param in signature(action).parameters.items():
+        value_type = getattr(param.annotation, "__origin__", param.annotation)
+        if attr == "self" or value_type not in type_map:
+            continue
+
+        desc = next(
+            (
+                y
+                for y in (getattr(x, "documentation", None) for x in getattr(param.annotation, "__metadata__", []))
+                if y
+            ),
+            None,
+        )
+        parameters.append(
+            {
+                "attr": attr,
+                "title": attr.replace("_", " ").title(),
+                "type": type_map[value_type],
+                "required": param.default == Parameter.empty,
+                "description": desc,
+            }
+        )
+    return parameters
+
+
+@dataclasses.dataclass(frozen=True)
+class _CompiledDetail:
+    fields: Sequence[_Column]
+    title: string.Template
+    actions: Mapping[str, Callable[..., Any]]
+    action_specs: Sequence[dict[str, Any]]
+    graphs: Mapping[str, GetGraphCallback]
+    graph_specs: Sequence[dict[str, Any]]
+
+
+@dataclasses.dataclass(frozen=True)
+class _ViewRegistry:
+    """
+    Configuration compiled into indexed metadata read by the handlers.
+    Everything which depends only on the configuration is computed here once, at startup.
+    """
+
+    resources: Mapping[str, Resource]
+    pages: Mapping[str, Page]
+    input_forms: Mapping[str, InputForm]
+    list_encoders: Mapping[str, _ListEncoder]
+    details: Mapping[str, _CompiledDetail]
+    create_schemas: Mapping[str, dict[str, Any]]
+    form_schemas: Mapping[str, dict[str, Any]]
+
+    @staticmethod
+    def _index(kind: str, items: Iterable[Any], key: Callable[[Any], str]) -> dict[str, Any]:
+        indexed: dict[str, Any] = {}
+        for item in items:
+            if (name := key(item)) in indexed:
+                raise ValueError(f"Duplicate {kind} name: {name}")
+            indexed[name] = item
+        return indexed
+
+    @classmethod
+    def compile(cls, config: AdminTableConfig) -> "_ViewRegistry":
+        resources: dict[str, Resource] = cls._index("resource", config.resources, lambda r: r.name)
+        input_forms: dict[str, InputForm] = cls._index("input form", config.input_forms, lambda f: f.location)
+
+        list_encoders: dict[str, _ListEncoder] = {}
+        details: dict[str, _CompiledDetail] = {}
+        create_schemas: dict[str, dict[str, Any]] = {}
+        for resource in resources.values():
+            # let resolvers precompute everything depending only on the configuration
+            resource.resolver.bind(resource)
+
+            if (list_view := resource.views.list) is not None:
+                encoder = list_encoders[resource.name] = cls.compile_list(resource, list_view)
+                cls.validate(
+                    resources,
+                    resource,
+                    "list view",
+                    encoder.header,
+                    [
+                        *([list_view.default_sort[0]] if list_view.default_sort[0] else []),
+                        *(f.ref for f in list_view.hidden_filters or []),
+                    ],
+                )
+            if (detail_view := resource.views.detail) is not None:
+                details[resource.name] = detail = cls.compile_detail(resource, detail_view)
+                cls.validate(
+                    resources, resource, "detail view", detail.fields, [t.filter_ref for t in detail_view.tables]
+                )
+                if unknown := {t.resource for t in detail_view.tables}.difference(resources):
+                    raise ValueError(f"Unknown resources {sorted(unknown)} in detail view of resource {resource.name}")
+            if (create_view := resource.views.create) is not None:
+                create_schemas[resource.name] = create_view.schema.model_json_schema()
+
+        return cls(
+            resources=MappingProxyType(resources),
+            pages=MappingProxyType(cls._index("page", config.pages, lambda p: p.name)),
+            input_forms=MappingProxyType(input_forms),
+            list_encoders=MappingProxyType(list_encoders),
+            details=MappingProxyType(details),
+            create_schemas=MappingProxyType(create_schemas),
+            form_schemas=MappingProxyType({name: f.schema.model_json_schema() for name, f in input_forms.items()}),
+        )
+
+    @staticmethod
+    def compile_list(resource: Resource, view: ListView) -> _ListEncoder:
+        header: list[_Column] = []
+        if resource.views.detail is not None:
+            header.append(
+                _LinkDetailColumn(
+                    resource=resource.name,
+                    id_ref=resource.id_col,
+                    ref=view.detail_value_ref or resource.id_col,
+                    display="Detail",
+                    sortable=True,
+                )
+            )
+        header.extend(field_resolver(view.fields))
+        return _ListEncoder(header)
+
+    @classmethod
+    def compile_detail(cls, resource: Resource, view: DetailView) -> _CompiledDetail:
+        actions = cls._index("action", view.actions, lambda a: a.__name__)
+        graphs = cls._index("graph", view.graphs, lambda g: g.__name__)
+        return _CompiledDetail(
+            fields=tuple(field_resolver(view.fields)),
+            title=string.Template(view.title or resource.display or resource.name),
+            actions=MappingProxyType(actions),
+            action_specs=tuple(
+                {
+                    "title": name.replace("_", " ").title(),
+                    "ref": name,
+                    "description": action.__doc__ or "",
+                    "parameters": _action_parameters(action),
+                }
+                for name, action in actions.items()
+            ),
+            graphs=MappingProxyType(graphs),
+            graph_specs=tuple(
+                {
+                    "title": name.replace("_", " ").title(),
+                    "description": graph.__doc__ or "",
+                    "reference": name,
+                }
+                for name, graph in graphs.items()
+            ),
+        )
+
+    @staticmethod
+    def validate(
+        resources: Mapping[str, Resource],
+        resource: Resource,
+        view_name: str,
+        columns: Iterable[_Column],
+        refs: Iterable[str],
+    ) -> None:
+        """Check that columns reference refs known to the resolver and resources which exist"""
+        used_refs = set(refs)
+        linked_resources = set()
+        for column in columns:
+            used_refs.update(column.refs or ())
+            if isinstance(column, _LinkDetailColumn | _LinkTableColumn):
+                linked_resources.add(column.resource)
+
+        known_refs = resource.resolver.get_refs(resource)
+        if known_refs is not None and (unknown := used_refs.difference(known_refs)):
+            raise ValueError(f"Invalid refs {sorted(unknown)} in {view_name} of resource {resource.name}")
+        if unknown := linked_resources.difference(resources):
+            raise ValueError(f"Unknown resources {sorted(unknown)} linked from {view_name} of resource {resource.name}")
+
+
 class ListViewMixin(AuthRouteMixin, _HasConfig):
     @AuthRouteMixin.protected
     async def resource_list_handler(self, request: AdminTableRoute.RouteRequest) -> AdminTableRoute.RouteResponse:
@@ -522,18 +850,19 @@ class ListViewMixin(AuthRouteMixin, _HasConfig):
             for ref, op, val in raw_filters
         ]
 
-        header: list[_Column] = []
-        if resource.views.detail is not None:
-            header.append(
-                _LinkDetailColumn(
-                    resource=resource.name,
-                    id_ref=resource.id_col,
-                    ref=view.detail_value_ref or resource.id_col,
-                    display="Detail",
-                    sortable=True,
+        encoder = self._registry.list_encoders[resource.name]
+
+        # cursor is ignored by views paged by offset
+        cursor = (request.query_params.get("cursor") or None) if view.pagination == "cursor" else None
+        if cursor is not None:
+            try:
+                ResolverBase.Cursor.decode(cursor)
+            except ValueError as e:
+                return AdminTableRoute.RouteResponse(
+                    status_code=400,
+                    body={"message": str(e)},
+                    content_type="application/json",
                 )
-            )
-        header.extend(field_resolver(view.fields))
 
         data = await resource.resolver.resolve_list(
             resource,
@@ -541,16 +870,32 @@ class ListViewMixin(AuthRouteMixin, _HasConfig):
             current_per_page,
             current_filters + (view.hidden_filters or []),
             current_sort,
+            pagination=view.pagination,
+            cursor=cursor,
+            count_strategy=view.count_strategy,
+            refs=encoder.refs,
         )
 
         # ##### PROCESS DATA INTO COLUMN FORMAT
-        rows = [[await h.value(row) for h in header] for row in data.list_data]
+        rows = await encoder.encode(data.list_data, asyncio.Semaphore(view.computed_concurrency))
 
         # ##### RESPONSE GENERATION
 
+        pagination: dict[str, Any] = {
+            "page": data.pagination["page"],
+            "per_page": data.pagination["per_page"],
+            "total": data.pagination["total"],
+            "total_mode": data.pagination["total_mode"],
+        }
+        if "has_more" in data.pagination:
+            pagination["has_more"] = data.pagination["has_more"]
+        if view.pagination == "cursor":
+            pagination["next_cursor"] = data.pagination["next_cursor"]
+            pagination["prev_cursor"] = data.pagination["prev_cursor"]
+
         body = {
             "data": rows,
-            "header": [await h.head(current_sort) for h in header],
+            "header": [await h.head(current_sort) for h in encoder.header],
             "meta": {
                 "title": title,
                 "description": description,
@@ -572,11 +917,7 @@ class ListViewMixin(AuthRouteMixin, _HasConfig):
                 }
                 for rf in resolved_filters.values()
             ],
-            "pagination": {
-                "page": data.pagination["page"],
-                "per_page": data.pagination["per_page"],
-                "total": data.pagination["total"],
-            },
+            "pagination": pagination,
         }
 
         return AdminTableRoute.RouteResponse(
@@ -588,17 +929,43 @@ class ListViewMixin(AuthRouteMixin, _HasConfig):
 class AdminTable(ListViewMixin, _HasConfig):
     class LiveDataTopic(TypedDict):
         task: asyncio.Task
-        clients: list["AdminTableWebsocket.Websocket"]
+        clients: list[LiveDataSubscriber]
+        stats: LiveDataTopicStats
+        # warm topics are produced also without subscribers
+        warm: bool
+        # monotonic time since when the topic has no subscribers, producer is stopped after the linger period
+        idle_since: float | None
+        linger: float
+        linger_timer: asyncio.TimerHandle | None
 
     _subscriber_info: dict[str, LiveDataTopic]
 
+    # navigation body depends only on the configuration, capabilities of the user and href base
+    navigation_cache_size = 256
+    _navigation_cache: dict[tuple[frozenset[str], str], bytes]
+
+    # history of topics is kept also when nobody is subscribed, so reconnecting clients can resume
+    live_data_history_topics = 1024
+    _live_data_history: dict[str, LiveDataHistory]
+
     def __init__(self, config: "AdminTableConfig"):
         super().__init__(config)
-
-        p = os.path.abspath(os.path.join(os.path.dirname(__file__), "ui/index.html"))
-        assert os.path.isfile(p), f"folder with UI not found at {p}"
+        self._navigation_cache = {}
 
         self._subscriber_info: dict[str, AdminTable.LiveDataTopic] = {}
+        self._live_data_history = {}
+        self._live_data_producers = LiveDataProducerStats()
+        self._shared_live_data: SharedLiveDataDispatcher | None = None
+        self._background_tasks: set[asyncio.Task] = set()
+
+    def invalidate(self) -> None:
+        super().invalidate()
+        self._navigation_cache.clear()
+
+    @functools.cached_property
+    def _assets(self) -> AssetStore:
+        # UI bundle is served from memory, loaded by the first request with content hashes and compressed variants
+        return AssetStore(os.path.abspath(os.path.join(os.path.dirname(__file__), "ui")))
 
     @property
     def routes(self) -> Sequence[AdminTableRoute]:
@@ -712,10 +1079,10 @@ class AdminTable(ListViewMixin, _HasConfig):
     async def live_data_websocket_accept(self, ws: AdminTableWebsocket.Websocket):
         r = await AdminTable.user_from_header(self, ws.headers)
         if isinstance(r, AdminTableRoute.RouteResponse):
-            if isinstance(r.body, str):
-                await ws.close(401, r.body)
-            else:
+            if isinstance(r.body, dict):
                 await ws.close(401, r.body.get("message", "Unauthorized"))
+            else:
+                await ws.close(401, r.body if isinstance(r.body, str) else r.body.decode())
 
             raise Exception("Unauthorized")
 
@@ -723,6 +1090,9 @@ class AdminTable(ListViewMixin, _HasConfig):
         print("accepting connection on: ", ws.url.path, "form: ", r)
         await ws.accept()
 
+        # startup handlers of mounted applications are not run, warm topics are started (or restarted) here too
+        await self.live_data_start_warm_topics()
+
     async def live_data_topic_task(self, topic: str):
         """
         live data manager task. For new subscribed topic, spins up "live data" task
@@ -733,37 +1103,252 @@ class AdminTable(ListViewMixin, _HasConfig):
         assert info is not None, f"topic {topic} not in subscriber info"
         assert self.config.live_data_manager is not None, "No live data manager configured"
 
+        manager = self._topic_manager(topic, info["stats"])
+        info["linger"] = manager.linger
+        history = self._topic_history(topic, manager.history_size)
         try:
-            async with self.config.live_data_manager(topic) as topic_iterable:
-                # if there are no clients, stop producing data
-                while info["clients"]:
-                    data = await anext(topic_iterable)
-
-                    clients = list(info["clients"])
-                    excs = await asyncio.gather(
-                        *(c.send_json({"value": data.value}) for c in clients), return_exceptions=True
-                    )
-                    for client, exc in zip(clients, excs):
-                        if exc and client in info["clients"]:
-                            info["clients"].remove(client)
-
+            # if there are no clients for longer than the linger period, the task is cancelled by the linger timer
+            async with manager as topic_iterable:
+                if manager.max_rate:
+                    await self.__coalesced_broadcast(topic, info, manager, history, topic_iterable)
+                else:
+                    async for data in topic_iterable:
+                        info["stats"].events += 1
+                        self.__broadcast(topic, info, manager, history, {"value": data.value})
+
+                # producer ended, new subscribers start a new producer from now on
+                self.__drop_topic(topic, info)
                 await topic_iterable.aclose()
         finally:
-            self._subscriber_info.pop(topic, None)
-            await asyncio.gather(*(c.close() for c in info["clients"]), return_exceptions=True)
+            self.__drop_topic(topic, info)
+            if info["linger_timer"] is not None:
+                info["linger_timer"].cancel()
+            self._live_data_producers.stopped += 1
+            # multiplexed connections carry other topics as well, only this topic ends for them
+            for client in info["clients"]:
+                if client.tagged:
+                    client.topics.discard(topic)
+                    client.backfill(encode_json({"topic": topic, "end": True}).decode())
+            await asyncio.gather(*(c.close() for c in info["clients"] if not c.tagged), return_exceptions=True)
+
+    def _topic_manager(self, topic: str, stats: LiveDataTopicStats) -> LiveDataManagerBase:
+        manager = self.config.live_data_manager
+        assert manager is not None, "No live data manager configured"
+        if not isinstance(manager, SharedLiveDataManagerBase):
+            return manager(topic)
+
+        # all topics of a shared manager are fed by one upstream
+        if self._shared_live_data is None or self._shared_live_data.manager is not manager:
+            self._shared_live_data = SharedLiveDataDispatcher(manager)
+        return self._shared_live_data.topic(topic, stats)
+
+    def __drop_topic(self, topic: str, info: "AdminTable.LiveDataTopic") -> None:
+        if self._subscriber_info.get(topic) is info:
+            del self._subscriber_info[topic]
+
+    def __client_left(self, topic: str, info: "AdminTable.LiveDataTopic") -> None:
+        # linger period starts when the last subscriber leaves, producer is stopped by a timer, even if idle
+        if info["clients"] or info["warm"] or info["linger_timer"] is not None:
+            return
+        info["idle_since"] = time.monotonic()
+        info["linger_timer"] = asyncio.get_running_loop().call_later(info["linger"], self.__linger_expired, topic, info)
+
+    def __linger_expired(self, topic: str, info: "AdminTable.LiveDataTopic") -> None:
+        info["linger_timer"] = None
+        if not info["clients"] and not info["warm"]:
+            # new subscribers start a new producer right away, while this one is being stopped
+            self.__drop_topic(topic, info)
+            info["task"].cancel()
 
-    async def live_data_websocket_handler(self, ws: AdminTableWebsocket.Websocket) -> None:
-        topic = ws.query_params["topic"]
+    @staticmethod
+    def __cancel_linger(info: "AdminTable.LiveDataTopic") -> None:
+        if info["linger_timer"] is not None:
+            info["linger_timer"].cancel()
+            info["linger_timer"] = None
+        info["idle_since"] = None
+
+    async def __coalesced_broadcast(
+        self,
+        topic: str,
+        info: "AdminTable.LiveDataTopic",
+        manager: LiveDataManagerBase,
+        history: LiveDataHistory | None,
+        topic_iterable,
+    ) -> None:
+        # producer is read by its own task as fast as it produces, clients get at most `max_rate` frames per second
+        assert manager.max_rate
+        coalescer = LiveDataCoalescer(summary=manager.coalesce == "summary")
+
+        async def consume():
+            async for data in topic_iterable:
+                info["stats"].events += 1
+                coalescer.add(data.value)
+
+        consumer = asyncio.create_task(consume())
+        loop = asyncio.get_running_loop()
+        interval = 1 / manager.max_rate
+        next_flush = loop.time()
+        try:
+            while not consumer.done():
+                next_flush = max(next_flush + interval, loop.time())
+                # end of the producer is noticed right away, not at the next flush
+                await asyncio.wait([consumer], timeout=next_flush - loop.time())
+                if (body := coalescer.flush()) is not None:
+                    self.__broadcast(topic, info, manager, history, body)
+
+            if consumer.done():
+                # producer finished or failed, re-raise its exception
+                consumer.result()
+        finally:
+            consumer.cancel()
+            await asyncio.gather(consumer, return_exceptions=True)
+            # events coalesced since the last flush are not lost, at least the history keeps them
+            if (body := coalescer.flush()) is not None:
+                self.__broadcast(topic, info, manager, history, body)
+
+    def __broadcast(
+        self,
+        topic: str,
+        info: "AdminTable.LiveDataTopic",
+        manager: LiveDataManagerBase,
+        history: LiveDataHistory | None,
+        body: dict[str, Any],
+    ) -> None:
+        # encode the event once, every client queues the same frame and sends it by its own writer task
+        # multiplexed connections receive frames tagged with the topic, encoded once as well
+        stats = info["stats"]
+        if history is not None:
+            body["ts"] = time.time()
+            history.append(body["ts"], body["value"])
+            body["resume"] = history.token
+        frame = encode_json(body).decode()
+        tagged_frame = None
+        stats.frames += 1
+        for client in list(info["clients"]):
+            client_frame = frame
+            if client.tagged:
+                if tagged_frame is None:
+                    tagged_frame = encode_json({"topic": topic, **body}).decode()
+                client_frame = tagged_frame
+
+            if client.writer.done():
+                # sending failed, client is gone (normally already removed by the writer done callback)
+                info["clients"].remove(client)
+                stats.disconnected += client.failed
+                self.__client_left(topic, info)
+            elif (dropped := client.push(client_frame, manager.queue_size, manager.overflow)) is None:
+                info["clients"].remove(client)
+                stats.disconnected += 1
+                self.__client_left(topic, info)
+                self._background(client.close())
+            else:
+                stats.dropped += dropped
 
-        # if this is the first topic subscriber, create the topic production task
-        if topic not in self._subscriber_info:
-            task = asyncio.create_task(self.live_data_topic_task(topic))
-            self._subscriber_info[topic] = {
-                "task": task,
-                "clients": [ws],
+    def _topic_history(self, topic: str, size: int) -> LiveDataHistory | None:
+        if size <= 0:
+            self._live_data_history.pop(topic, None)
+            return None
+
+        history = self._live_data_history.get(topic)
+        if history is None or history.size != size:
+            if history is None and len(self._live_data_history) >= self.live_data_history_topics:
+                # drop the oldest history of a topic nobody is subscribed to
+                inactive = (t for t in self._live_data_history if t not in self._subscriber_info)
+                if (oldest := next(inactive, None)) is not None:
+                    del self._live_data_history[oldest]
+            history = self._live_data_history[topic] = LiveDataHistory(size)
+        return history
+
+    def _background(self, coroutine) -> None:
+        """Run the coroutine in a task which is referenced until it finishes"""
+        task = asyncio.create_task(coroutine)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def live_data_metrics(self) -> dict[str, dict[str, int]]:
+        """
+        Per topic number of subscribers, frames queued for them, counters of produced events, sent frames,
+        dropped frames, disconnects and events of a shared upstream dropped before the topic task read them
+        """
+        return {
+            topic: {
+                "subscribers": len(info["clients"]),
+                "queued": sum(len(c.queue) for c in info["clients"]),
+                "max_queued": max((len(c.queue) for c in info["clients"]), default=0),
+                "events": info["stats"].events,
+                "frames": info["stats"].frames,
+                "dropped": info["stats"].dropped,
+                "disconnected": info["stats"].disconnected,
+                "upstream_dropped": info["stats"].upstream_dropped,
             }
-        else:
-            self._subscriber_info[topic]["clients"].append(ws)
+            for topic, info in self._subscriber_info.items()
+        }
+
+    def live_data_subscribe(self, topic: str, subscriber: LiveDataSubscriber, resume: str | None = None) -> None:
+        # kept events (or those missed since the resume token) are sent first, latest value included
+        if (history := self._live_data_history.get(topic)) and (events := history.since(resume)):
+            body: dict[str, Any] = {"value": events[-1][1], "history": events, "resume": history.token}
+            subscriber.backfill(encode_json({"topic": topic, **body} if subscriber.tagged else body).decode())
+
+        # if this is the first topic subscriber, create the topic production task
+        if (info := self._subscriber_info.get(topic)) is None:
+            info = self._start_topic(topic)
+        elif not info["clients"] and not info["warm"]:
+            # producer is still lingering after the last subscriber left
+            self._live_data_producers.reused += 1
+            self.__cancel_linger(info)
+        info["clients"].append(subscriber)
+        subscriber.writer.add_done_callback(lambda _: self.__subscriber_gone(topic, subscriber))
+
+    def __subscriber_gone(self, topic: str, subscriber: LiveDataSubscriber) -> None:
+        # writer of the subscriber ended, a failed send disconnects the client from the topic right away
+        if (info := self._subscriber_info.get(topic)) and subscriber in info["clients"]:
+            info["clients"].remove(subscriber)
+            info["stats"].disconnected += subscriber.failed
+            self.__client_left(topic, info)
+
+    def _start_topic(self, topic: str, warm: bool = False) -> "AdminTable.LiveDataTopic":
+        # task starts running only after the topic is registered
+        task = asyncio.create_task(self.live_data_topic_task(topic))
+        info = self._subscriber_info[topic] = {
+            "task": task,
+            "clients": [],
+            "stats": LiveDataTopicStats(),
+            "warm": warm,
+            "idle_since": None,
+            "linger": self.config.live_data_manager.linger if self.config.live_data_manager else 0,
+            "linger_timer": None,
+        }
+        self._live_data_producers.started += 1
+        return info
+
+    async def live_data_start_warm_topics(self) -> None:
+        """
+        Start producers of `live_data_warm_topics` which are not running, they keep running regardless of subscribers
+        """
+        for topic in self.config.live_data_warm_topics:
+            if (info := self._subscriber_info.get(topic)) is None:
+                self._start_topic(topic, warm=True)
+            else:
+                info["warm"] = True
+                self.__cancel_linger(info)
+
+    def live_data_producer_metrics(self) -> dict[str, int]:
+        """Producers started and stopped since start, subscriptions which reused a lingering producer"""
+        return {
+            **dataclasses.asdict(self._live_data_producers),
+            "running": len(self._subscriber_info),
+            "lingering": sum(not i["clients"] and not i["warm"] for i in self._subscriber_info.values()),
+        }
+
+    def live_data_unsubscribe(self, topic: str, subscriber: LiveDataSubscriber) -> None:
+        # topic task stops producing once it has no clients left
+        if (tpc := self._subscriber_info.get(topic)) and subscriber in tpc["clients"]:
+            tpc["clients"].remove(subscriber)
+            self.__client_left(topic, tpc)
+
+    async def live_data_websocket_handler(self, ws: AdminTableWebsocket.Websocket) -> None:
+        self.live_data_subscribe(ws.query_params["topic"], LiveDataSubscriber(ws), ws.query_params.get("resume"))
 
         # loop forever, until client disconnects (raises ConnectionClosed)
         while True:
@@ -773,7 +1358,54 @@ class AdminTable(ListViewMixin, _HasConfig):
     async def live_data_websocket_disconnect(self, ws: AdminTableWebsocket.Websocket):
         topic = ws.query_params["topic"]
         if tpc := self._subscriber_info.get(topic):
-            tpc["clients"].remove(ws) if ws in tpc["clients"] else None
+            for client in [c for c in tpc["clients"] if c.ws is ws]:
+                tpc["clients"].remove(client)
+                client.writer.cancel()
+            self.__client_left(topic, tpc)
+
+    async def live_data_multiplex_handler(self, ws: AdminTableWebsocket.Websocket) -> None:
+        """
+        Live data of many topics over a single connection.
+        Client sends `{"action": "subscribe" | "unsubscribe", "topics": [...]}`, optionally with
+        `"resume": {"<topic>": "<resume token>"}`, server sends `{"topic": ..., "value": ...}`
+        for every event of the subscribed topics. When the producer of a topic ends, server sends
+        `{"topic": ..., "end": true}` and the topic can be subscribed again.
+        """
+        subscriber = LiveDataSubscriber(ws, tagged=True)
+        topics = subscriber.topics
+        try:
+            # loop forever, until client disconnects (raises ConnectionClosed)
+            while True:
+                msg: Any = await ws.receive_json()
+                if not isinstance(msg, dict):
+                    await ws.send_json({"error": f"Invalid message: {msg}"})
+                    continue
+
+                action, requested, resume = msg.get("action"), msg.get("topics"), msg.get("resume") or {}
+                if (
+                    action not in ("subscribe", "unsubscribe")
+                    or not isinstance(requested, list)
+                    or not isinstance(resume, dict)
+                    or not all(isinstance(token, str) for token in resume.values())
+                ):
+                    await ws.send_json({"error": f"Invalid message: {msg}"})
+                    continue
+
+                for topic in map(str, requested):
+                    if action == "subscribe" and topic not in topics:
+                        topics.add(topic)
+                        self.live_data_subscribe(topic, subscriber, resume.get(topic))
+                    elif action == "unsubscribe" and topic in topics:
+                        topics.discard(topic)
+                        self.live_data_unsubscribe(topic, subscriber)
+        finally:
+            for topic in topics:
+                self.live_data_unsubscribe(topic, subscriber)
+            subscriber.writer.cancel()
+
+    async def live_data_multiplex_disconnect(self, ws: AdminTableWebsocket.Websocket):
+        # subscriptions are dropped when the handler exits
+        return None
 
     @property
     def websockets(self) -> Sequence[AdminTableWebsocket]:
@@ -784,7 +1416,14 @@ class AdminTable(ListViewMixin, _HasConfig):
                 accept=self.live_data_websocket_accept,
                 handle=self.live_data_websocket_handler,
                 disconnected=self.live_data_websocket_disconnect,
-            )
+            ),
+            AdminTableWebsocket(
+                path="/ws/live_data/multiplex",
+                name="websocket_multiplex",
+                accept=self.live_data_websocket_accept,
+                handle=self.live_data_multiplex_handler,
+                disconnected=self.live_data_multiplex_disconnect,
+            ),
         ]
 
     @AuthRouteMixin.protected
@@ -867,50 +1506,59 @@ class AdminTable(ListViewMixin, _HasConfig):
     async def navigation_handler(self, r: AdminTableRoute.RouteRequest) -> AdminTableRoute.RouteResponse:
         href_base = f"{r.url.scheme}://{r.url.host}:{r.url.port}{(r.url.path or '').removesuffix('/navigation')}"
 
+        key = (frozenset(r.user.capabilities if r.user else ()), href_base)
+        if (body := self._navigation_cache.get(key)) is None:
+            if len(self._navigation_cache) >= self.navigation_cache_size:
+                # drop the oldest entry
+                del self._navigation_cache[next(iter(self._navigation_cache))]
+            body = self._navigation_cache[key] = encode_json(self.navigation(href_base))
+
+        return AdminTableRoute.RouteResponse(body=body, content_type="application/json")
+
+    def navigation(self, href_base: str) -> dict[str, Any]:
+        """Navigation drawers with links accessible to the current user"""
+
         # TODO allow for custom drawer ordering
         drawers = []
         for res in self.config.resources + self.config.pages:
             drawers.append(res.navigation) if res.navigation not in drawers else None
 
-        return AdminTableRoute.RouteResponse(
-            body={
-                "name": self.config.name,
-                "icon_src": self.config.icon_src,
-                "version": self.config.version,
-                "navigation": [
-                    {
-                        "name": drawer,
-                        "icon": self.config.navigation_icons.get(drawer or "", "x") or "x",
-                        "links": [
-                            {
-                                "name": resource.name,
-                                "display": resource.display or resource.name,
-                                "href": {"list": f"{href_base}/resource/{quote(resource.name)}/list"},
-                                "type": "resource",
-                            }
-                            for resource in self.config.resources
-                            if resource.navigation == drawer
-                            and not resource.hidden
-                            and resource.views.list is not None
-                            and (self.check_capabilities(resource) is None)
-                            and (self.check_capabilities(resource.views.list) is None)
-                        ]
-                        + [
-                            {
-                                "name": page.name,
-                                "display": page.display or page.name,
-                                "href": {"view": f"{href_base}/page/{quote(page.name)}/view"},
-                                "type": "page",
-                            }
-                            for page in self.config.pages
-                            if page.navigation == drawer and (page.public or (self.check_capabilities(page) is None))
-                        ],
-                    }
-                    for drawer in drawers
-                ],
-            },
-            content_type="application/json",
-        )
+        return {
+            "name": self.config.name,
+            "icon_src": self.config.icon_src,
+            "version": self.config.version,
+            "navigation": [
+                {
+                    "name": drawer,
+                    "icon": self.config.navigation_icons.get(drawer or "", "x") or "x",
+                    "links": [
+                        {
+                            "name": resource.name,
+                            "display": resource.display or resource.name,
+                            "href": {"list": f"{href_base}/resource/{quote(resource.name)}/list"},
+                            "type": "resource",
+                        }
+                        for resource in self.config.resources
+                        if resource.navigation == drawer
+                        and not resource.hidden
+                        and resource.views.list is not None
+                        and (self.check_capabilities(resource) is None)
+                        and (self.check_capabilities(resource.views.list) is None)
+                    ]
+                    + [
+                        {
+                            "name": page.name,
+                            "display": page.display or page.name,
+                            "href": {"view": f"{href_base}/page/{quote(page.name)}/view"},
+                            "type": "page",
+                        }
+                        for page in self.config.pages
+                        if page.navigation == drawer and (page.public or (self.check_capabilities(page) is None))
+                    ],
+                }
+                for drawer in drawers
+            ],
+        }
 
     async def page_view_handler(self, request: AdminTableRoute.RouteRequest) -> AdminTableRoute.RouteResponse:
         page = self.get_page(request.path_params["page_name"])
@@ -948,7 +1596,7 @@ class AdminTable(ListViewMixin, _HasConfig):
 
         return AdminTableRoute.RouteResponse(
             body={
-                "schema": view.schema.model_json_schema(),
+                "schema": self._registry.create_schemas[resource.name],
             },
             content_type="application/json",
         )
@@ -994,51 +1642,12 @@ class AdminTable(ListViewMixin, _HasConfig):
                 content_type="application/json",
             )
 
-        fields = [(await field.head(None), await field.value(entry)) for field in field_resolver(detail.fields)]
-
-        title_template = string.Template(detail.title or resource.display or resource.name)
-        title = title_template.safe_substitute(entry)
+        compiled = self._registry.details[resource.name]
+        fields = [(await field.head(None), await field.value(entry)) for field in compiled.fields]
+        title = compiled.title.safe_substitute(entry)
 
         description = detail.description(entry) if callable(detail.description) else detail.description
 
-        def get_param(attr: str, param: Parameter) -> dict[str, Any]:
-            type_map = {int: "int", str: "str", Parameter.empty: "str", bool: "bool"}
-            desc = next(
-                (
-                    y
-                    for y in (getattr(x, "documentation", None) for x in getattr(param.annotation, "__metadata__", []))
-                    if y
-                ),
-                None,
-            )
-            value_type = getattr(param.annotation, "__origin__", param.annotation)
-            assert value_type in type_map, f"Unsupported type: {value_type}"
-
-            return {
-                "attr": attr,
-                "title": attr.replace("_", " ").title(),
-                "type": type_map[value_type],
-                "required": param.default == Parameter.empty,
-                "description": desc,
-            }
-
-        actions = []
-        for action in detail.actions:
-            actions.append(
-                {
-                    "title": action.__name__.replace("_", " ").title(),
-                    "ref": action.__name__,
-                    "description": action.__doc__ or "",
-                    "parameters": [
-                        get_param(attr, param)
-                        for attr, param in signature(action).parameters.items()
-                        if attr != "self"
-                        and getattr(param.annotation, "__origin__", param.annotation)
-                        in [int, str, bool, Parameter.empty]
-                    ],
-                }
-            )
-
         tables = []
         for table in detail.tables:
             tables.append(
@@ -1054,26 +1663,14 @@ class AdminTable(ListViewMixin, _HasConfig):
                 }
             )
 
-        graphs = []
-        for graph in detail.graphs:
-            ref = graph.__name__
-            display = graph.__name__.replace("_", " ").title()
-            graphs.append(
-                {
-                    "title": display,
-                    "description": graph.__doc__ or "",
-                    "reference": ref,
-                }
-            )
-
         return AdminTableRoute.RouteResponse(
             body={
                 "title": title,
                 "description": description,
                 "fields": fields,
-                "actions": actions,
+                "actions": compiled.action_specs,
                 "tables": tables,
-                "graphs": graphs,
+                "graphs": compiled.graph_specs,
             },
             content_type="application/json",
         )
@@ -1088,9 +1685,7 @@ class AdminTable(ListViewMixin, _HasConfig):
         if (response := (self.check_capabilities(resource) or self.check_capabilities(detail))) is not None:
             return response
 
-        data_function: GetGraphCallback | None = next(
-            (g for g in detail.graphs if g.__name__ == request.path_params["graph_ref"]), None
-        )
+        data_function = self._registry.details[resource.name].graphs.get(request.path_params["graph_ref"])
 
         if data_function is None:
             return AdminTableRoute.RouteResponse(
@@ -1153,7 +1748,7 @@ class AdminTable(ListViewMixin, _HasConfig):
 
         # TODO capabilities for separate actions
 
-        action = next((a for a in detail.actions if a.__name__ == request.path_params["action_ref"]), None)
+        action = self._registry.details[resource.name].actions.get(request.path_params["action_ref"])
         if not action:
             return AdminTableRoute.RouteResponse(
                 status_code=200,
@@ -1221,7 +1816,7 @@ class AdminTable(ListViewMixin, _HasConfig):
                 "title": form.title,
                 "public": form.public,
                 "description": description,
-                "schema": form.schema.model_json_schema(),
+                "schema": self._registry.form_schemas[form.location],
             },
             content_type="application/json",
         )
@@ -1256,27 +1851,42 @@ class AdminTable(ListViewMixin, _HasConfig):
     async def default_handler(
         self, request: AdminTableRoute.RouteRequest, fallback=True
     ) -> AdminTableRoute.RouteResponse:
-        p = os.path.abspath(os.path.join(os.path.dirname(__file__), "ui/", request.path_params["path"] or "index.html"))
-        try:
-            with open(p) as f:
-                data = f.read()
-                return AdminTableRoute.RouteResponse(
-                    status_code=200,
-                    body=data,
-                    content_type={"html": "text/html", "js": "text/javascript", "css": "text/css"}.get(
-                        p.split(".")[-1], "text/plain"
-                    ),
-                )
-        except FileNotFoundError:
+        asset = self._assets.get(request.path_params["path"])
+        if asset is None:
             if fallback:
+                # unknown paths are routes of the UI, which are handled by the index
                 return await self.default_handler(
-                    AdminTableRoute.RouteRequest(url=request.url, path_params={"path": ""}), fallback=False
+                    AdminTableRoute.RouteRequest(url=request.url, path_params={"path": ""}, headers=request.headers),
+                    fallback=False,
                 )
             return AdminTableRoute.RouteResponse(
                 status_code=404,
                 body="Not Found",
             )
 
+        body, etag = asset.body, asset.etag
+        headers = {"Cache-Control": asset.cache_control}
+        if asset.gzip_body is not None:
+            # 304 responses carry Vary as well
+            headers["Vary"] = "Accept-Encoding"
+            if accepts_encoding(request.headers.get("accept-encoding", ""), "gzip"):
+                body, etag = asset.gzip_body, asset.gzip_etag
+                headers["Content-Encoding"] = "gzip"
+        headers["ETag"] = etag
+
+        # conditional request for the content browser already has
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")) or if_none_match == "*":
+            headers.pop("Content-Encoding", None)
+            return AdminTableRoute.RouteResponse(status_code=304, body=b"", headers=headers)
+
+        return AdminTableRoute.RouteResponse(
+            status_code=200,
+            body=body,
+            headers=headers,
+            content_type=asset.content_type,
+        )
+
     async def process_handler_return(
         self, callback_ret: Any, current_resource: Resource | None = None
     ) -> AdminTableRoute.RouteResponse:
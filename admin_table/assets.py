@@ -0,0 +1,96 @@
+import dataclasses
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+
+# bundler output names files in the assets folder as `name-<content hash>.ext`, such files never change
+HASHED_FILENAME = re.compile(r"^assets/.+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+
+# text based types are worth compressing, images and fonts usually are compressed already
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml", "application/xml")
+COMPRESS_MIN_SIZE = 1024
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+@dataclasses.dataclass(frozen=True)
+class Asset:
+    body: bytes
+    etag: str
+    content_type: str
+    gzip_body: bytes | None = None
+    immutable: bool = False
+
+    @property
+    def cache_control(self) -> str:
+        return IMMUTABLE_CACHE_CONTROL if self.immutable else REVALIDATE_CACHE_CONTROL
+
+    @property
+    def gzip_etag(self) -> str:
+        # every representation needs its own validator, so caches never mix them up
+        return f'{self.etag[:-1]}-gz"'
+
+
+def accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    """Whether the Accept-Encoding header allows the coding, with q-values and `*` taken into account"""
+    wildcard: float | None = None
+    for entry in accept_encoding.split(","):
+        name, _, params = entry.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        name = name.strip().lower()
+        if name == coding:
+            return quality > 0
+        if name == "*":
+            wildcard = quality
+    return wildcard is not None and wildcard > 0
+
+
+class AssetStore:
+    """
+    Static UI files loaded into memory once.
+    Every asset carries a content hash used as ETag and a gzip variant when compression pays off.
+    Missing folder (UI not built) gives an empty store, every path is then not found.
+    """
+
+    def __init__(self, root: str, index: str = "index.html"):
+        self.root = root
+        self.index = index
+        self.assets: dict[str, Asset] = {}
+
+        for directory, _, files in os.walk(root):
+            for name in files:
+                path = os.path.relpath(os.path.join(directory, name), root).replace(os.sep, "/")
+                self.assets[path] = self.load(root, path)
+
+    @staticmethod
+    def load(root: str, path: str) -> Asset:
+        with open(os.path.join(root, path), "rb") as f:
+            body = f.read()
+
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        gzip_body = None
+        if len(body) >= COMPRESS_MIN_SIZE and content_type.startswith(COMPRESSIBLE_TYPES):
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            gzip_body = compressed if len(compressed) < len(body) else None
+
+        return Asset(
+            body=body,
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            content_type=content_type,
+            gzip_body=gzip_body,
+            immutable=HASHED_FILENAME.match(path) is not None,
+        )
+
+    def get(self, path: str) -> Asset | None:
+        """Asset stored under the path relative to the root, index for an empty path"""
+        return self.assets.get(path or self.index)
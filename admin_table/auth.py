@@ -1,11 +1,20 @@
 import abc
+import asyncio
 import dataclasses
+import functools
+import hashlib
+import time
 import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Generic, TypeVar
 
 import jwt
 
+from .keyring import Keyring
+from .revocation import MemoryRevocationStore, RevocationStoreBase
+
 JWT_SIGN_KEY = str(uuid.uuid4())
 
 
@@ -34,11 +43,120 @@ class TokenTypes:
     refresh = "ref"
 
 
+T = TypeVar("T")
+
+
+class VerifiedTokenCache(Generic[T]):
+    """
+    LRU of already verified tokens, keyed by hash of the token.
+    Every entry expires together with its token, so a cached token is never accepted after its `exp`.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[float, T]] = OrderedDict()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> T | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.time():
+            del self._entries[key]
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: bytes, value: T, expires_at: float) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: bytes) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def info(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "max_size": self.max_size}
+
+
+class AuthorizationCache:
+    """
+    Capabilities returned by `authorize()` kept for a TTL.
+    Concurrent lookups of the same user wait for a single `authorize()` call.
+    """
+
+    def __init__(self, ttl: timedelta):
+        self.ttl = ttl.total_seconds()
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, tuple[float, list[str]]] = {}
+        self._pending: dict[str, asyncio.Future[list[str]]] = {}
+        # bumped by invalidation, results of calls started before it are not stored
+        self._generation = 0
+
+    async def get(self, user_id: str, authorize: Callable[[str], Awaitable[list[str]]]) -> list[str]:
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return list(entry[1])
+
+        self.misses += 1
+        if (pending := self._pending.get(user_id)) is None:
+            pending = self._pending[user_id] = asyncio.ensure_future(self._authorize(user_id, authorize))
+            pending.add_done_callback(lambda f: self._pending.pop(user_id) if self._pending.get(user_id) is f else None)
+
+        # shielded, so a cancelled request does not cancel the call other requests are waiting for
+        return list(await asyncio.shield(pending))
+
+    async def _authorize(self, user_id: str, authorize: Callable[[str], Awaitable[list[str]]]) -> list[str]:
+        generation = self._generation
+        capabilities = await authorize(user_id)
+        if generation == self._generation:
+            self.put(user_id, capabilities)
+        return capabilities
+
+    def put(self, user_id: str, capabilities: list[str]) -> None:
+        self._entries[user_id] = (time.monotonic() + self.ttl, list(capabilities))
+
+    def invalidate(self, user_id: str | None = None) -> None:
+        self._generation += 1
+        if user_id is None:
+            self._entries.clear()
+            self._pending.clear()
+        else:
+            self._entries.pop(user_id, None)
+            self._pending.pop(user_id, None)
+
+    def info(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
 class AuthHelpers:
     access_expiration = timedelta(minutes=1)
     refresh_expiration = timedelta(minutes=5)
+    # key used when no keyring is set, random per process, so tokens are valid only in the process which issued them
     sign_key = JWT_SIGN_KEY
     sign_algo = "HS256"
+    # keys shared by all processes, e.g. `Keyring.from_env()` or `RotatingKeyring.from_env()`, overrides `sign_key`
+    keyring: Keyring | None = None
+
+    # number of verified access tokens kept in memory, 0 disables the cache
+    access_token_cache_size = 4096
 
     def _encoded(self, payload: dict[str, Any], token_type: str, expire_in: timedelta) -> str:
         full_payload = {
@@ -47,12 +165,29 @@ class AuthHelpers:
             "typ": token_type,
             **payload,
         }
-        encoded_jwt = jwt.encode(full_payload, self.sign_key, algorithm=self.sign_algo)
-        return encoded_jwt
+        if self.keyring is None:
+            return jwt.encode(full_payload, self.sign_key, algorithm=self.sign_algo)
+
+        kid, key = self.keyring.current()
+        return jwt.encode(full_payload, key, algorithm=self.sign_algo, headers={"kid": kid})
+
+    def _kid(self, token) -> str | None:
+        return jwt.get_unverified_header(token).get("kid") if self.keyring is not None else None
+
+    def _key(self, kid: str | None) -> str | None:
+        """Key verifying tokens signed with `kid`, None if the key is unknown or was removed from the keyring"""
+        if self.keyring is None:
+            return self.sign_key
+        return self.keyring.get(kid) if kid is not None else None
+
+    def _verification_key(self, token) -> str:
+        if (key := self._key(self._kid(token))) is None:
+            raise InvalidAccessTokenException("Invalid access token. Unknown signing key.")
+        return key
 
     def _decoded(self, token, expected_typ: str) -> dict[str, Any]:
         try:
-            payload = jwt.decode(token, self.sign_key, algorithms=[self.sign_algo])
+            payload = jwt.decode(token, self._verification_key(token), algorithms=[self.sign_algo])
         except jwt.ExpiredSignatureError:
             raise InvalidAccessTokenException("Access token has expired.")
         except jwt.InvalidTokenError as e:
@@ -85,23 +220,45 @@ class AuthHelpers:
         }
         return self._encoded(payload, TokenTypes.refresh, expire_in=self.refresh_expiration)
 
-    @dataclasses.dataclass
+    # shared by all requests with the same token through the cache, so it is immutable
+    @dataclasses.dataclass(frozen=True)
     class DecodedAccessToken:
         user_id: str
         display: str
-        capabilities: list[str]
+        capabilities: tuple[str, ...]
+
+    @functools.cached_property
+    def access_token_cache(self) -> VerifiedTokenCache[tuple[DecodedAccessToken, str | None, str]]:
+        """
+        Verified access tokens with the kid and key which verified them, `access_token_cache.info()` reports
+        hits and misses
+        """
+        return VerifiedTokenCache(self.access_token_cache_size)
 
     def decode_access_token(self, access_token: str) -> DecodedAccessToken:
+        # the same token is sent with every request of the UI, verify its signature only once
+        cache_key = self.access_token_cache.key(access_token)
+        if (cached := self.access_token_cache.get(cache_key)) is not None:
+            decoded, cached_kid, cached_key = cached
+            # signing key removed from (or replaced in) the keyring revokes the cached tokens too
+            if self._key(cached_kid) == cached_key:
+                return decoded
+            self.access_token_cache.discard(cache_key)
+
         payload = self._decoded(access_token, expected_typ=TokenTypes.access)
+        kid = self._kid(access_token)
 
         if not (cap := payload.get("cap")):
             raise InvalidAccessTokenException("Invalid access token. Does not contain cap.")
 
-        return self.DecodedAccessToken(
+        decoded = self.DecodedAccessToken(
             user_id=payload["sub"],
             display=payload["display"],
-            capabilities=cap,
+            capabilities=tuple(cap),
         )
+        if (expires_at := payload.get("exp")) is not None and (key := self._key(kid)) is not None:
+            self.access_token_cache.put(cache_key, (decoded, kid, key), expires_at)
+        return decoded
 
     @dataclasses.dataclass
     class DecodedRefreshToken:
@@ -123,6 +280,10 @@ class AuthHelpers:
 
 
 class AuthProviderBase(abc.ABC, AuthHelpers):
+    # capabilities returned by `authorize` are reused for token refreshes within this time, None disables the cache
+    # after changing capabilities of a user call `invalidate_authorization`, otherwise the change applies after the TTL
+    authorization_cache_ttl: timedelta | None = None
+
     @dataclasses.dataclass
     class AuthInfo:
         access_token: str
@@ -159,9 +320,28 @@ class AuthProviderBase(abc.ABC, AuthHelpers):
     # set of functions used by the frontend
     # ######
 
+    @functools.cached_property
+    def revocation_store(self) -> RevocationStoreBase:
+        """
+        Store of refresh tokens revoked by logout, in memory of the current process by default.
+        With multiple worker processes override it with a shared store, e.g. `SQLiteRevocationStore`.
+        """
+        return MemoryRevocationStore()
+
+    @functools.cached_property
+    def authorization_cache(self) -> AuthorizationCache | None:
+        return AuthorizationCache(self.authorization_cache_ttl) if self.authorization_cache_ttl is not None else None
+
+    def invalidate_authorization(self, user_id: str | None = None) -> None:
+        """Drop cached capabilities of the user (or of all users), next refresh calls `authorize` again"""
+        if self.authorization_cache is not None:
+            self.authorization_cache.invalidate(user_id)
+
     async def login(self, username: str, password: str, otp: str | None) -> AuthInfo:
         user = await self.authenticate(username, password, otp)
         capabilities = await self.authorize(user.user_id)
+        if self.authorization_cache is not None:
+            self.authorization_cache.put(user.user_id, capabilities)
         return self.AuthInfo(
             access_token=self.generate_access_token(
                 user_id=user.user_id, display=user.display, capabilities=capabilities
@@ -174,9 +354,13 @@ class AuthProviderBase(abc.ABC, AuthHelpers):
     async def refresh(self, refresh_token: str) -> AuthInfo:
         decoded_refresh_token = self.decode_refresh_token(refresh_token)
 
-        # TODO check refresh token revocation
+        if await self.revocation_store.is_revoked(decoded_refresh_token.jwt_id):
+            raise InvalidAccessTokenException("Refresh token has been revoked.")
 
-        capabilities = await self.authorize(decoded_refresh_token.user_id)
+        if self.authorization_cache is not None:
+            capabilities = await self.authorization_cache.get(decoded_refresh_token.user_id, self.authorize)
+        else:
+            capabilities = await self.authorize(decoded_refresh_token.user_id)
 
         if (datetime.now(timezone.utc) - decoded_refresh_token.expiry) < self.refresh_expiration / 2:
             refresh_token = self.generate_refresh_token(
@@ -193,9 +377,8 @@ class AuthProviderBase(abc.ABC, AuthHelpers):
         )
 
     async def logout(self, refresh_token: str):
-        self.decode_refresh_token(refresh_token)
-        # TODO refresh token revocation
-        return
+        decoded_refresh_token = self.decode_refresh_token(refresh_token)
+        await self.revocation_store.revoke(decoded_refresh_token.jwt_id, decoded_refresh_token.expiry)
 
     @dataclasses.dataclass
     class AuthorizedUserInfo:
@@ -233,7 +416,7 @@ class AuthProviderBase(abc.ABC, AuthHelpers):
         return self.AuthorizedUserInfo(
             user_id=decoded_access_token.user_id,
             display=decoded_access_token.display,
-            capabilities=decoded_access_token.capabilities,
+            capabilities=list(decoded_access_token.capabilities),
         )
 
 
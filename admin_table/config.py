@@ -1,6 +1,6 @@
 import abc
 import dataclasses
-from collections.abc import Awaitable, Callable, Sequence
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
 from datetime import datetime
 from types import TracebackType
 from typing import (
@@ -13,6 +13,7 @@ from typing import (
     TypeAlias,
     TypedDict,
     TypeVar,
+    Union,
 )
 
 from pydantic import BaseModel
@@ -21,9 +22,10 @@ from sqlalchemy.orm import InstrumentedAttribute
 from typing_extensions import Doc
 
 from .auth import AuthProviderBase
+from .live_data import CoalescePolicy, OverflowPolicy
 
 if TYPE_CHECKING:
-    from admin_table.modules.bases.resolver import ResolverBase
+    from admin_table.modules.bases.resolver import CountStrategy, ResolverBase
 
 
 # copied directly from source of UI library
@@ -85,8 +87,16 @@ class AdminTableConfig:
         ),
     ] = dataclasses.field(default_factory=list)
     live_data_manager: Annotated[
-        type["LiveDataManagerBase"] | None, Doc("Live data manager to be used for live data updates")
+        Union[type["LiveDataManagerBase"], "SharedLiveDataManagerBase", None],
+        Doc(
+            "Live data manager to be used for live data updates. Either a class instantiated for every topic,"
+            " or an instance of a shared manager serving all topics from one upstream."
+        ),
     ] = None
+    live_data_warm_topics: Annotated[
+        Sequence[str],
+        Doc("Live data topics produced from the application start, regardless of subscribers"),
+    ] = ()
     get_user_info: Annotated[
         Callable[[str], dict[str, Any] | Awaitable[dict[str, Any]]] | None,
         Doc(
@@ -198,6 +208,32 @@ class LiveValue:
     # TODO history range settings
 
 
+@dataclasses.dataclass
+class Computed:
+    """Field computed from the row by a function"""
+
+    """Function receiving the row and returning the displayed value"""
+    handler: Callable[[Any], Any | Awaitable[Any]]
+
+    """
+    Refs read by the handler. List views select only the refs needed by their fields,
+    when not provided, the handler is expected to need the full row and all columns are selected.
+    Plain callables used as fields behave the same as Computed without refs.
+    """
+    refs: Sequence[str] | None = None
+
+
+@dataclasses.dataclass
+class ComputedBatch:
+    """Field computed for the whole page of rows by a single function call"""
+
+    """Function receiving the rows and returning the displayed values, one for each row in the same order"""
+    handler: Callable[[Sequence[Any]], Sequence[Any] | Awaitable[Sequence[Any]]]
+
+    """Refs read by the handler, same as for Computed"""
+    refs: Sequence[str] | None = None
+
+
 """
 Type for field definitions
   - str: provided string is used as the column name and to resolve the column from the model
@@ -208,11 +244,24 @@ Type for field definitions
   - [str, InstrumentedAttribute]: column name, attribute from which key is used to resolve the column from the model
   - [str, LinkEntity]: column name, link to another entity
   - [str, LinkTable]: column name, link to another table
+  - [str, Callable]: column name, function computing the value from the row
+  - [str, Computed]: column name, function computing the value from the row with declared refs
+  - [str, ComputedBatch]: column name, function computing the values for all rows on the page at once
   - [str, str, str]: same as two-tuples, but with second item being a description
 
 if the value starts with prefix [[markdown]] or [[html]] it will be rendered as such...
 """
-ResolvableFieldType = str | Column | InstrumentedAttribute | Callable[[Any], Any] | LinkDetail | LinkTable | LiveValue
+ResolvableFieldType = (
+    str
+    | Column
+    | InstrumentedAttribute
+    | Callable[[Any], Any]
+    | LinkDetail
+    | LinkTable
+    | LiveValue
+    | Computed
+    | ComputedBatch
+)
 FieldName = str
 FieldDescription = str
 ListViewFieldType = (
@@ -237,6 +286,26 @@ class ListView(ViewBase):
         ),
     ] = (None, "asc")
 
+    pagination: Annotated[
+        Literal["offset", "cursor"],
+        Doc(
+            "Pagination mode. 'offset' allows jumping to any page, but deeper pages get slower on large tables."
+            " 'cursor' seeks using the sort column and the id column, so every page costs the same as the first one."
+            " Cursors are returned in the pagination block, page number is used only when no cursor is provided."
+            " The bundled UI does not send cursors yet and keeps paging by page number, cursors serve API clients."
+        ),
+    ] = "offset"
+
+    count_strategy: Annotated[
+        "CountStrategy | None",
+        Doc("Strategy used to get the total number of entries, defaults to the one configured on the resolver"),
+    ] = None
+
+    computed_concurrency: Annotated[
+        int,
+        Doc("Maximum number of async computed values awaited concurrently when rendering a page"),
+    ] = 16
+
     hidden_filters: Annotated[
         list["ResolverBase.AppliedFilter"] | None,
         Doc(
@@ -408,11 +477,57 @@ class InputForm(CapabilitiesMixin):
     ]
 
 
-class LiveDataManagerBase(abc.ABC):
+class LiveDataSettings:
+    """Settings of live data topics, shared by both kinds of live-data managers"""
+
+    # every subscriber has its own queue of frames waiting to be sent
+    queue_size: Annotated[int, Doc("Maximum number of frames queued for a single subscriber")] = 64
+    overflow: Annotated[
+        OverflowPolicy,
+        Doc(
+            "What happens when queue of a subscriber is full."
+            " 'drop_oldest' drops the oldest queued frame, 'keep_latest' drops all queued frames and keeps only"
+            " the latest one, 'disconnect' closes the connection of the subscriber."
+        ),
+    ] = "drop_oldest"
+    history_size: Annotated[
+        int,
+        Doc(
+            "Number of latest events of the topic kept by the server. New subscribers receive them in a single"
+            " backfill frame, reconnecting clients only the events they missed. 0 disables the history."
+        ),
+    ] = 50
+    max_rate: Annotated[
+        float | None,
+        Doc(
+            "Maximum number of frames per second sent to subscribers. Events produced faster are coalesced"
+            " and the producer is read independently of the sending. None sends every event."
+        ),
+    ] = None
+    coalesce: Annotated[
+        CoalescePolicy,
+        Doc(
+            "How events are coalesced when `max_rate` is set. 'latest' sends only the latest value,"
+            " 'summary' sends also minimum, maximum and number of the coalesced events."
+        ),
+    ] = "latest"
+    linger: Annotated[
+        float,
+        Doc(
+            "Seconds the producer keeps running after the last subscriber left, so clients which come back soon"
+            " (navigation between pages, reconnect) do not restart it. 0 stops the producer immediately."
+        ),
+    ] = 5.0
+
+
+class LiveDataManagerBase(LiveDataSettings, abc.ABC):
     """
     Base class for live-data manager
     Creation of the manager is de-duplicated by the application
     It is safe to assume that there are never two instances with same topic used.
+    With several worker processes this holds per process, `live_data_broker.LocalBrokerLiveDataManager`
+    makes it hold per host.
+    Settings can be overridden per topic by setting them in __init__.
     """
 
     @dataclasses.dataclass
@@ -432,3 +547,36 @@ class LiveDataManagerBase(abc.ABC):
     async def __aexit__(
         self, exc_type: type[BaseException], exc_val: BaseException, exc_tb: TracebackType
     ) -> bool | None: ...
+
+
+class SharedLiveDataManagerBase(LiveDataSettings, abc.ABC):
+    """
+    Base class for live-data manager which owns one upstream for all topics,
+    e.g. a single wildcard MQTT or Redis subscription instead of one subscription per topic.
+    A single instance is used by the application. Topics are registered when their producer starts
+    and unregistered when it stops, events are dispatched to the topics by `DataEvent.topic`.
+    Settings apply to all topics.
+    """
+
+    @dataclasses.dataclass
+    class DataEvent:
+        topic: str
+        value: str
+
+    @abc.abstractmethod
+    async def __aenter__(self) -> AsyncIterator["SharedLiveDataManagerBase.DataEvent"]:
+        """Open the upstream, returns the events of all topics"""
+
+    @abc.abstractmethod
+    async def __aexit__(
+        self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None
+    ) -> bool | None: ...
+
+    async def register(self, topic: str) -> None:
+        """
+        Topic has subscribers, upstream can start delivering its events.
+        When the upstream ends, all topics are dropped without `unregister` and registered again after reopening.
+        """
+
+    async def unregister(self, topic: str) -> None:
+        """Topic has no subscribers anymore, events of the topic are ignored from now on"""
@@ -0,0 +1,134 @@
+import hashlib
+import hmac
+import json
+import os
+import time
+from collections.abc import Mapping
+from datetime import timedelta
+
+
+class Keyring:
+    """
+    Signing keys identified by `kid`.
+    Tokens are signed with the current key and the `kid` is written to their header,
+    so they can be verified by any process having the same keyring, also after the current key changes.
+    """
+
+    def __init__(self, keys: Mapping[str, str], current: str):
+        if current not in keys:
+            raise ValueError(f"Current key {current} is not in the keyring")
+        self._keys = dict(keys)
+        self._current = current
+
+    def current(self) -> tuple[str, str]:
+        """kid and secret used to sign new tokens"""
+        return self._current, self._keys[self._current]
+
+    def get(self, kid: str) -> str | None:
+        """Secret used to verify tokens signed with `kid`, None if the key is unknown or no longer valid"""
+        return self._keys.get(kid)
+
+    @staticmethod
+    def _parse(data: str) -> tuple[dict[str, str], str]:
+        # either {"current": "<kid>", "keys": {"<kid>": "<secret>", ...}} or the secret itself
+        try:
+            parsed = json.loads(data)
+        except json.JSONDecodeError:
+            parsed = None
+        if not isinstance(parsed, dict):
+            return {"default": data.strip()}, "default"
+        for field in ("keys", "current"):
+            if field not in parsed:
+                raise ValueError(f"Keyring is missing the '{field}' field")
+        if not isinstance(parsed["keys"], dict):
+            raise ValueError("Keyring field 'keys' has to map kid to secret")
+        return parsed["keys"], parsed["current"]
+
+    @classmethod
+    def from_env(cls, variable: str = "ADMIN_TABLE_SIGN_KEYS") -> "Keyring":
+        """Keyring from an environment variable, which holds the keyring JSON or a single secret"""
+        if not (data := os.environ.get(variable)):
+            raise ValueError(f"Environment variable {variable} with signing keys is not set")
+        return cls(*cls._parse(data))
+
+    @classmethod
+    def from_file(cls, path: str) -> "FileKeyring":
+        """Keyring from a file holding the keyring JSON or a single secret, reloaded when the file changes"""
+        return FileKeyring(path)
+
+
+class FileKeyring(Keyring):
+    """
+    Keyring loaded from a file, the file is read again whenever it changes.
+    Keys are rotated by adding a new key, switching `current` to it and removing the old key
+    only after all tokens signed by it expired.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mtime = 0
+        self._reload()
+
+    def _reload(self) -> None:
+        mtime = os.stat(self.path).st_mtime_ns
+        if mtime == self._mtime:
+            return
+        with open(self.path) as f:
+            super().__init__(*self._parse(f.read()))
+        self._mtime = mtime
+
+    def current(self) -> tuple[str, str]:
+        self._reload()
+        return super().current()
+
+    def get(self, kid: str) -> str | None:
+        self._reload()
+        return super().get(kid)
+
+
+class RotatingKeyring(Keyring):
+    """
+    Keys derived from a master secret, a new key is used every `rotate_every`.
+    Processes sharing the master secret derive the same keys without any coordination.
+    Tokens remain valid for `overlap` rotation periods after their key was replaced,
+    `rotate_every * overlap` should not be shorter than the refresh token expiration.
+    """
+
+    def __init__(self, master_secret: str, rotate_every: timedelta = timedelta(days=1), overlap: int = 1):
+        self._master_secret = master_secret.encode()
+        self.rotate_every = rotate_every.total_seconds()
+        self.overlap = overlap
+        self._derived: dict[int, str] = {}
+
+    def _secret(self, period: int) -> str:
+        if (secret := self._derived.get(period)) is None:
+            secret = hmac.new(self._master_secret, f"r{period}".encode(), hashlib.sha256).hexdigest()
+            # keep only keys which can still be used
+            self._derived = {p: s for p, s in self._derived.items() if p >= period - self.overlap}
+            self._derived[period] = secret
+        return secret
+
+    def _period(self) -> int:
+        return int(time.time() // self.rotate_every)
+
+    def current(self) -> tuple[str, str]:
+        period = self._period()
+        return f"r{period}", self._secret(period)
+
+    def get(self, kid: str) -> str | None:
+        if not kid.startswith("r") or not kid[1:].isdigit():
+            return None
+        period, current = int(kid[1:]), self._period()
+        # one period ahead is accepted because of clock differences between hosts
+        if not current - self.overlap <= period <= current + 1:
+            return None
+        return self._secret(period)
+
+    @classmethod
+    def from_env(
+        cls, variable: str = "ADMIN_TABLE_SIGN_KEY", rotate_every: timedelta = timedelta(days=1), overlap: int = 1
+    ) -> "RotatingKeyring":
+        """Rotating keyring with the master secret taken from an environment variable"""
+        if not (master_secret := os.environ.get(variable)):
+            raise ValueError(f"Environment variable {variable} with the master signing key is not set")
+        return cls(master_secret, rotate_every, overlap)
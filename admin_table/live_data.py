@@ -0,0 +1,170 @@
+import asyncio
+import dataclasses
+import secrets
+import sys
+from array import array
+from collections import deque
+from typing import TYPE_CHECKING, Any, Literal, TypeAlias, cast
+
+if TYPE_CHECKING:
+    from .application import AdminTableWebsocket
+
+OverflowPolicy: TypeAlias = Literal["drop_oldest", "keep_latest", "disconnect"]
+CoalescePolicy: TypeAlias = Literal["latest", "summary"]
+
+
+@dataclasses.dataclass
+class LiveDataTopicStats:
+    events: int = 0
+    frames: int = 0
+    dropped: int = 0
+    disconnected: int = 0
+    # events of a shared upstream dropped before the topic task read them
+    upstream_dropped: int = 0
+
+
+@dataclasses.dataclass
+class LiveDataProducerStats:
+    started: int = 0
+    stopped: int = 0
+    reused: int = 0
+
+
+class LiveDataCoalescer:
+    """
+    Events of a topic produced between two flushes, reduced to the latest value,
+    with `summary` also to the minimum, maximum and number of the events.
+    """
+
+    def __init__(self, summary: bool = False):
+        self.summary = summary
+        self._reset()
+
+    def _reset(self) -> None:
+        self.last: str | None = None
+        self.count = 0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    def add(self, value: str) -> None:
+        self.last = value
+        self.count += 1
+        if self.summary:
+            try:
+                number = float(value)
+            except ValueError:
+                # not a number, only the latest value is sent
+                return
+            self.min = number if self.min is None else min(self.min, number)
+            self.max = number if self.max is None else max(self.max, number)
+
+    def flush(self) -> dict[str, Any] | None:
+        """Body of the frame for events added since the last flush, None if there were none"""
+        if self.last is None:
+            return None
+        body: dict[str, Any] = {"value": self.last}
+        if self.summary:
+            body.update(min=self.min, max=self.max, count=self.count)
+        self._reset()
+        return body
+
+
+class LiveDataHistory:
+    """
+    Latest `size` events of a topic, kept in preallocated arrays so memory of a topic never grows.
+    Events are numbered, `<epoch>.<number>` is the resume token which lets a reconnecting client
+    receive only the events it missed.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        # distinguishes tokens issued by another buffer (e.g. before restart of the server)
+        self.epoch = secrets.token_hex(4)
+        self.count = 0
+        self._timestamps = array("d", bytes(8 * size))
+        self._values: list[str | None] = [None] * size
+
+    @property
+    def token(self) -> str:
+        return f"{self.epoch}.{self.count}"
+
+    def append(self, timestamp: float, value: str) -> None:
+        index = self.count % self.size
+        self._timestamps[index] = timestamp
+        self._values[index] = value
+        self.count += 1
+
+    def since(self, token: str | None = None) -> list[tuple[float, str]]:
+        """Events after the resume token, all kept events if the token is missing, unknown or too old"""
+        start = max(0, self.count - self.size)
+        epoch, _, number = (token or "").partition(".")
+        if epoch == self.epoch and number.isdigit() and start <= int(number) <= self.count:
+            start = int(number)
+        return [
+            (self._timestamps[i % self.size], cast(str, self._values[i % self.size])) for i in range(start, self.count)
+        ]
+
+
+class LiveDataSubscriber:
+    """
+    Websocket subscribed to live data.
+    Frames are queued and written by a task of the subscriber, so a slow client never blocks the producer
+    or other subscribers of the topic.
+    """
+
+    def __init__(self, ws: "AdminTableWebsocket.Websocket", tagged: bool = False):
+        self.ws = ws
+        # subscriber of multiplexed connection, receives frames tagged with the topic
+        self.tagged = tagged
+        # topics subscribed by the multiplexed connection
+        self.topics: set[str] = set()
+        self.queue: deque[str] = deque()
+        self.sent = 0
+        self.dropped = 0
+        self._ready = asyncio.Event()
+        self.writer = asyncio.create_task(self._write())
+        self.writer.add_done_callback(self._writer_done)
+
+    def push(self, frame: str, max_size: int, overflow: OverflowPolicy) -> int | None:
+        """Queue the frame, returns number of frames dropped to make room, None if the client has to be disconnected"""
+        dropped = 0
+        if len(self.queue) >= max_size:
+            if overflow == "disconnect":
+                return None
+            if overflow == "keep_latest":
+                dropped = len(self.queue)
+                self.queue.clear()
+            else:
+                dropped = 1
+                self.queue.popleft()
+            self.dropped += dropped
+
+        self.queue.append(frame)
+        self._ready.set()
+        return dropped
+
+    def backfill(self, frame: str) -> None:
+        """Queue the frame regardless of the queue size, used for history sent on subscribe"""
+        self.queue.append(frame)
+        self._ready.set()
+
+    async def _write(self) -> None:
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            while self.queue:
+                await self.ws.send_text(self.queue.popleft())
+                self.sent += 1
+
+    def _writer_done(self, task: asyncio.Task) -> None:
+        # sending failed, the exception is retrieved here so it is not reported as never retrieved
+        if not task.cancelled() and (e := task.exception()) is not None:
+            print(f"Failed sending live data to {self.ws.url.path}: {e!r}", file=sys.stderr)
+
+    @property
+    def failed(self) -> bool:
+        return self.writer.done() and not self.writer.cancelled() and self.writer.exception() is not None
+
+    async def close(self) -> None:
+        self.writer.cancel()
+        await asyncio.gather(self.ws.close(), return_exceptions=True)
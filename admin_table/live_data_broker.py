@@ -0,0 +1,214 @@
+import asyncio
+import dataclasses
+import fcntl
+import json
+import os
+import socket
+import sys
+import traceback
+from collections.abc import AsyncIterator
+from types import TracebackType
+
+from ._json import encode_json
+from .config import LiveDataManagerBase, LiveDataSettings, SharedLiveDataManagerBase
+
+# events are JSON lines, values may be long
+LINE_LIMIT = 2**20
+# events for a worker which does not read them are dropped once this many bytes wait to be sent
+WRITE_BUFFER_LIMIT = 2**20
+PRODUCER_RESTART_DELAY = 1.0
+
+
+@dataclasses.dataclass
+class _BrokerTopic:
+    clients: set[asyncio.StreamWriter] = dataclasses.field(default_factory=set)
+    task: asyncio.Task | None = None
+    dropped: int = 0
+
+
+class LiveDataBroker:
+    """Runs one producer per topic and relays its events to the subscribed workers"""
+
+    def __init__(self, manager: type[LiveDataManagerBase], path: str):
+        self.manager = manager
+        self.path = path
+        self.topics: dict[str, _BrokerTopic] = {}
+        # producers being stopped, a new producer of the topic waits until the previous one exits
+        self._stopping: dict[str, asyncio.Task] = {}
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        # socket file left by a broker which is not running anymore
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(self.path)
+        # only processes of the same user may connect, restricted before the socket starts listening
+        os.chmod(self.path, 0o600)
+        self._server = await asyncio.start_unix_server(self._client, sock=sock, limit=LINE_LIMIT)
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            async for line in reader:
+                msg = json.loads(line)
+                if topic := msg.get("register"):
+                    self._register(topic, writer)
+                elif topic := msg.get("unregister"):
+                    self._unregister(topic, writer)
+        except (ConnectionError, ValueError) as e:
+            print(f"live data broker client failed: {e}", file=sys.stderr)
+        finally:
+            for topic in [t for t, i in self.topics.items() if writer in i.clients]:
+                self._unregister(topic, writer)
+            writer.close()
+
+    def _register(self, topic: str, writer: asyncio.StreamWriter) -> None:
+        info = self.topics.setdefault(topic, _BrokerTopic())
+        info.clients.add(writer)
+        if info.task is None:
+            info.task = asyncio.create_task(self._produce(topic, info, self._stopping.get(topic)))
+
+    def _unregister(self, topic: str, writer: asyncio.StreamWriter) -> None:
+        if (info := self.topics.get(topic)) is None:
+            return
+        info.clients.discard(writer)
+        if not info.clients:
+            # last worker left, producer is stopped (workers linger on their side)
+            del self.topics[topic]
+            if info.task is not None:
+                info.task.cancel()
+                self._stopping[topic] = info.task
+                info.task.add_done_callback(
+                    lambda t: self._stopping.pop(topic, None) if self._stopping.get(topic) is t else None
+                )
+
+    async def _produce(self, topic: str, info: _BrokerTopic, previous: asyncio.Task | None) -> None:
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+
+        # producer is restarted while any worker is subscribed
+        while info.clients:
+            try:
+                async with self.manager(topic) as topic_iterable:
+                    async for data in topic_iterable:
+                        # encoded once for all workers
+                        line = encode_json({"topic": topic, "value": data.value}) + b"\n"
+                        for writer in info.clients:
+                            if writer.transport.get_write_buffer_size() >= WRITE_BUFFER_LIMIT:
+                                info.dropped += 1
+                            else:
+                                writer.write(line)
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+            await asyncio.sleep(PRODUCER_RESTART_DELAY)
+
+
+class LocalBrokerLiveDataManager(SharedLiveDataManagerBase):
+    """
+    Live data of all worker processes of a host produced once.
+    Workers connect to a broker listening on a Unix socket, the first worker which finds no broker running
+    becomes the broker. Broker runs exactly one producer per topic, regardless of the number of workers,
+    and relays its events to every worker with subscribers of the topic.
+
+        live_data_manager=LocalBrokerLiveDataManager(MyLiveDataManager, "/run/my_app/live_data.sock")
+
+    `manager` is the live-data manager of a single topic, which is run by the broker only.
+    Settings of `manager` apply to the topics, overriding them per topic in `__init__` is not supported.
+    Brokers of different applications on the same host need different `path`.
+
+    When the worker running the broker exits, the other workers reconnect, one of them becomes the broker
+    and subscribed topics are registered again, websockets of the clients stay open.
+    """
+
+    def __init__(self, manager: type[LiveDataManagerBase], path: str, connect_attempts: int = 10):
+        self.manager = manager
+        self.path = path
+        self.connect_attempts = connect_attempts
+        for setting in LiveDataSettings.__annotations__:
+            setattr(self, setting, getattr(manager, setting))
+
+        # broker run by this process, lock file decides which process runs the broker
+        self.broker: LiveDataBroker | None = None
+        self._lock_fd: int | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        # registered topics, registered again after reconnecting to a new broker
+        self._topics: set[str] = set()
+
+    def _acquire_broker_lock(self) -> bool:
+        fd = os.open(f"{self.path}.lock", os.O_CREAT | os.O_RDWR, 0o600)
+        try:
+            # held until the process exits, then another worker can take over
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        for attempt in range(self.connect_attempts):
+            try:
+                return await asyncio.open_unix_connection(self.path, limit=LINE_LIMIT)
+            except (FileNotFoundError, ConnectionRefusedError):
+                if self.broker is None and self._acquire_broker_lock():
+                    self.broker = LiveDataBroker(self.manager, self.path)
+                    await self.broker.start()
+                else:
+                    # another worker is starting the broker
+                    await asyncio.sleep(0.05 * (attempt + 1))
+        raise ConnectionError(f"Cannot connect to the live data broker at {self.path}")
+
+    async def __aenter__(self) -> AsyncIterator[SharedLiveDataManagerBase.DataEvent]:
+        reader, self._writer = await self._connect()
+        return self._events(reader)
+
+    async def __aexit__(
+        self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None
+    ) -> bool | None:
+        # broker run by this process keeps serving the other workers
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._topics.clear()
+        return None
+
+    async def _events(self, reader: asyncio.StreamReader) -> AsyncIterator[SharedLiveDataManagerBase.DataEvent]:
+        while True:
+            try:
+                async for line in reader:
+                    msg = json.loads(line)
+                    yield self.DataEvent(topic=msg["topic"], value=msg["value"])
+            except ConnectionError as e:
+                print(f"live data broker connection failed: {e}", file=sys.stderr)
+
+            # broker is gone with its worker, lock is free for another worker to take over
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            reader, writer = await self._connect()
+            # registered in one write, topics (un)registered meanwhile are not missed nor duplicated
+            for topic in self._topics:
+                writer.write(encode_json({"register": topic}) + b"\n")
+            self._writer = writer
+            await self._drain()
+
+    async def _drain(self) -> None:
+        try:
+            if self._writer is not None:
+                await self._writer.drain()
+        except ConnectionError:
+            # topics are registered again after reconnecting
+            pass
+
+    async def _send(self, msg: dict[str, str]) -> None:
+        if self._writer is not None:
+            self._writer.write(encode_json(msg) + b"\n")
+            await self._drain()
+
+    async def register(self, topic: str) -> None:
+        self._topics.add(topic)
+        await self._send({"register": topic})
+
+    async def unregister(self, topic: str) -> None:
+        self._topics.discard(topic)
+        await self._send({"unregister": topic})
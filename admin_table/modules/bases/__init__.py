@@ -1,2 +1,4 @@
+from .resolver import CountStrategy as CountStrategy
 from .resolver import ResolvedData as ResolvedData
+from .resolver import ResolvedRow as ResolvedRow
 from .resolver import ResolverBase as ResolverBase
@@ -1,16 +1,144 @@
 import abc
+import base64
 import dataclasses
-from typing import TYPE_CHECKING, Annotated, Literal, TypeAlias
+import json
+import uuid
+from collections.abc import Callable, Collection, Iterator, Mapping, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Annotated, Any, ClassVar, Literal, TypeAlias
 
 from typing_extensions import Doc
 
 if TYPE_CHECKING:
     from admin_table.config import Resource
 
-ResolvedData: TypeAlias = dict[str, str]
+ResolvedData: TypeAlias = Mapping[str, Any]
+
+CountStrategy: TypeAlias = Annotated[
+    Literal["exact", "cached", "estimated", "window", "has_more"],
+    Doc(
+        """
+        How the total number of entries in the list is obtained
+          - exact: separate count query
+          - cached: exact count cached for a while, keyed by the applied filters
+          - estimated: estimate from the database planner statistics, falls back to exact when not available
+          - window: `count(*) OVER ()` computed alongside the page in a single query
+          - has_more: no counting at all, only checks whether there is a next page
+        """
+    ),
+]
+
+
+class ResolvedRow(Mapping[str, Any]):
+    """
+    Compact read-only row backed by a tuple.
+    Values can be accessed both as items (`row["email"]`) and as attributes (`row.email`),
+    so the row can be passed both to the views and to user callbacks (actions, graphs, computed fields).
+
+    Use `ResolvedRow.make_type` to generate row type for a fixed set of fields, ideally once per resource.
+    """
+
+    __slots__ = ("_values",)
+
+    _fields: ClassVar[tuple[str, ...]] = ()
+    _index: ClassVar[dict[str, int]] = {}
+
+    def __init__(self, values: Sequence[Any]):
+        self._values = tuple(values)
+
+    @classmethod
+    def make_type(cls, name: str, fields: Sequence[str]) -> type["ResolvedRow"]:
+        namespace: dict[str, Any] = {
+            "__slots__": (),
+            "_fields": tuple(fields),
+            "_index": {field: i for i, field in enumerate(fields)},
+        }
+
+        # fields shadowing row methods (e.g. `items`, `keys`) are accessible only as items
+        for i, field in enumerate(fields):
+            if field.isidentifier() and not hasattr(cls, field):
+                namespace[field] = property(cls._value_getter(i), doc=f"Value of {field}")
+
+        return type(name, (cls,), namespace)
+
+    @staticmethod
+    def _value_getter(index: int) -> Callable[["ResolvedRow"], Any]:
+        def getter(row: "ResolvedRow") -> Any:
+            return row._values[index]
+
+        return getter
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._index[key]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{k}={v!r}' for k, v in zip(self._fields, self._values))})"
+
+
+def _encode_cursor_value(value: Any) -> Any:
+    # JSON native types are kept as they are, others are tagged so they can be restored
+    if value is None or isinstance(value, bool | int | float | str):
+        return value
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {"uuid": str(value)}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    raise TypeError(f"Value of type {type(value)} cannot be used in cursor")
+
+
+def _decode_cursor_value(value: Any) -> Any:
+    if isinstance(value, list):
+        raise ValueError(f"Invalid cursor value: {value}")
+    if not isinstance(value, dict):
+        return value
+    match value:
+        case {"dt": v}:
+            return datetime.fromisoformat(v)
+        case {"d": v}:
+            return date.fromisoformat(v)
+        case {"uuid": v}:
+            return uuid.UUID(v)
+        case {"dec": v}:
+            return Decimal(v)
+    raise ValueError(f"Invalid cursor value: {value}")
 
 
 class ResolverBase(abc.ABC):
+    def bind(self, resource: "Resource") -> None:
+        """
+        Called once by the application for every resource using this resolver.
+        Resolvers can use it to precompute anything which depends only on the resource configuration.
+        """
+        return None
+
+    def invalidate(self, resource: "Resource | None" = None) -> None:
+        """
+        Drop anything precomputed in `bind` for the given resource (or for all resources).
+        Next call will compute it again.
+        """
+        return None
+
+    def get_refs(self, resource: "Resource") -> Collection[str] | None:
+        """
+        Refs which can be resolved for the resource, used to validate view configuration at startup.
+        Resolvers which do not know their refs up front return None and the validation is skipped.
+        """
+        return None
+
     @dataclasses.dataclass
     class AppliedFilter:
         ref: str
@@ -21,7 +149,45 @@ class ResolverBase(abc.ABC):
     @dataclasses.dataclass
     class ResolvedListData:
         list_data: Annotated[list[ResolvedData], Doc("List of all resolved data entries")]
-        pagination: dict[Literal["page", "per_page", "total"], int]
+        pagination: Annotated[
+            dict[Literal["page", "per_page", "total", "total_mode", "has_more", "next_cursor", "prev_cursor"], Any],
+            Doc(
+                "`total_mode` is the count strategy which actually produced the `total`."
+                " With `has_more` the total is only a lower bound and `has_more` tells if there is a next page."
+                " Cursors are included only when using cursor pagination, None when there is no such page."
+            ),
+        ]
+
+    @dataclasses.dataclass(frozen=True)
+    class Cursor:
+        """Position in the list used by cursor pagination, passed to the client as an opaque string"""
+
+        sort: tuple[str, str]
+        direction: Literal["next", "prev"]
+        values: Annotated[tuple[Any, ...], Doc("Values of the sort and id column of the boundary entry")]
+
+        def encode(self) -> str:
+            payload = {
+                "s": list(self.sort),
+                "d": self.direction,
+                "v": [_encode_cursor_value(v) for v in self.values],
+            }
+            raw = json.dumps(payload, separators=(",", ":")).encode()
+            return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+        @classmethod
+        def decode(cls, cursor: str) -> "ResolverBase.Cursor":
+            try:
+                payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+                direction = payload["d"]
+                assert direction in ("next", "prev")
+                if not isinstance(payload["v"], list) or len(payload["v"]) != 2:
+                    raise ValueError("Cursor has to contain the sort value and the id value")
+                values = tuple(_decode_cursor_value(v) for v in payload["v"])
+                return cls(sort=(payload["s"][0], payload["s"][1]), direction=direction, values=values)
+            # invalid decimals raise decimal.InvalidOperation, which is an ArithmeticError
+            except (ValueError, TypeError, KeyError, IndexError, AssertionError, ArithmeticError) as e:
+                raise ValueError(f"Invalid cursor: {cursor}") from e
 
     @abc.abstractmethod
     async def resolve_list(
@@ -31,6 +197,19 @@ class ResolverBase(abc.ABC):
         per_page: int,
         filters: list[AppliedFilter],
         sort: tuple[str, Literal["asc", "desc"]],
+        pagination: Annotated[
+            Literal["offset", "cursor"],
+            Doc("In cursor mode, `next_cursor` and `prev_cursor` have to be returned in the pagination"),
+        ] = "offset",
+        cursor: Annotated[str | None, Doc("Cursor returned by previous call, `page` is used when missing")] = None,
+        count_strategy: Annotated[CountStrategy | None, Doc("Overrides default count strategy of the resolver")] = None,
+        refs: Annotated[
+            Collection[str] | None,
+            Doc(
+                "Refs which have to be present in the resolved entries, None resolves all of them."
+                " Id and sort refs have to be always included."
+            ),
+        ] = None,
     ) -> ResolvedListData:
         raise NotImplementedError()
 
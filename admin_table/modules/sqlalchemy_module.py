@@ -1,9 +1,26 @@
 import ast
+import asyncio
 import dataclasses
-from collections.abc import Callable, Generator
-from typing import Annotated, Any, Literal, cast
-
-from sqlalchemy import BinaryExpression, ColumnElement, Row, select
+import json
+import logging
+import operator
+import time
+from collections.abc import Callable, Collection, Generator, Sequence
+from typing import Annotated, Any, Literal, TypeVar, cast
+
+from sqlalchemy import (
+    BinaryExpression,
+    ColumnElement,
+    Select,
+    Table,
+    and_,
+    func,
+    literal_column,
+    or_,
+    select,
+    text,
+)
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import (
     ColumnProperty,
@@ -17,10 +34,12 @@ from sqlalchemy.sql.functions import count
 from typing_extensions import Doc
 
 from admin_table.config import Resource
-from admin_table.modules.bases import ResolvedData, ResolverBase
+from admin_table.modules.bases import CountStrategy, ResolvedData, ResolvedRow, ResolverBase
 
 SQLAlchemyListView_FieldType = str | InstrumentedAttribute | Query | ColumnElement
 
+_T = TypeVar("_T")
+
 
 class SQLAlchemyResolver(ResolverBase):
     model: type[DeclarativeBase]
@@ -38,22 +57,113 @@ class SQLAlchemyResolver(ResolverBase):
             dict[str, Query | ColumnElement | InstrumentedAttribute] | None,
             Doc("Extra columns to be added to the list view"),
         ] = None,
+        count_strategy: Annotated[
+            CountStrategy, Doc("Default strategy used to get total of the list, can be overridden by the view")
+        ] = "exact",
+        count_cache_ttl: Annotated[float, Doc("Seconds for which the 'cached' strategy reuses the total")] = 60,
+        count_cache_size: Annotated[int, Doc("Maximal number of filter combinations with cached total")] = 1024,
+        concurrent_count: Annotated[
+            bool,
+            Doc(
+                "Run count and page queries at the same time, each on its own pooled connection."
+                " Applies only to async sessions, list latency then approaches the slower of the two queries."
+            ),
+        ] = False,
+        late_extra_cols: Annotated[
+            bool,
+            Doc(
+                "Compute `extra_cols` in a second query only for the entries on the page, instead of within the"
+                " filtered, sorted and limited query. Lists filtered or sorted by an extra column use a single query."
+            ),
+        ] = True,
     ):
         self.model = model
         self.extra_cols = extra_cols or {}
+        self.count_strategy = count_strategy
+        self.count_cache_ttl = count_cache_ttl
+        self.count_cache_size = count_cache_size
+        self.concurrent_count = concurrent_count
+        self.late_extra_cols = late_extra_cols
+        self.__plans: dict[str, SQLAlchemyResolver.__ResolutionPlan] = {}
+        self.__count_cache: dict[tuple, tuple[float, int]] = {}
         if isinstance(session(), AsyncSession):
             self.async_session_maker = cast(Callable[[], AsyncSession], session)
         else:
             self.session_maker = cast(Callable[[], Session], session)
 
-    @dataclasses.dataclass
+    @dataclasses.dataclass(frozen=True)
     class __ListColumns:
         ref: str
         src: Any
+        python_type: Annotated[Callable[[Any], Any] | None, Doc("Used to cast filter values, None if unknown")]
         sortable: bool = False
+        nullable: Annotated[bool, Doc("Column can contain NULLs, which cursor pagination has to order explicitly")] = (
+            True
+        )
+        extra: Annotated[
+            bool, Doc("Column comes from `extra_cols`, it may replace a model column of the same name")
+        ] = False
+
+    @dataclasses.dataclass(frozen=True)
+    class __ResolutionPlan:
+        """Everything derived from the model and `extra_cols`, compiled once per resource"""
+
+        columns: dict[str, "SQLAlchemyResolver.__ListColumns"]
+        id_column: "SQLAlchemyResolver.__ListColumns"
+        select_columns: tuple[Any, ...]
+        filter_options: dict[str, ResolverBase.FilterOption]
+        row_type: Annotated[type[ResolvedRow], Doc("Row type matching `select_columns`")]
+        projections: Annotated[
+            dict[frozenset[str], tuple[tuple[Any, ...], type[ResolvedRow]]],
+            Doc("Select columns and row type of every column subset requested so far"),
+        ] = dataclasses.field(default_factory=dict)
+
+    def bind(self, resource: "Resource") -> None:
+        self.__plans[resource.name] = self.__compile_plan(resource)
+
+    def invalidate(self, resource: "Resource | None" = None) -> None:
+        if resource is None:
+            self.__plans.clear()
+            self.__count_cache.clear()
+        else:
+            self.__plans.pop(resource.name, None)
+            self.__count_cache = {k: v for k, v in self.__count_cache.items() if k[0] != resource.name}
+
+    def __resolution_plan(self, resource: "Resource") -> __ResolutionPlan:
+        """Returns plan compiled by `bind`, compiling it now if the resolver has not been bound yet"""
+        if (plan := self.__plans.get(resource.name)) is None:
+            plan = self.__plans[resource.name] = self.__compile_plan(resource)
+        return plan
+
+    def __projection(
+        self, plan: __ResolutionPlan, refs: Collection[str] | None, sort_ref: str
+    ) -> tuple[tuple[Any, ...], type[ResolvedRow]]:
+        """Select columns and row type containing only the requested refs (and columns needed for paging)"""
+        if refs is None:
+            return plan.select_columns, plan.row_type
+
+        key = frozenset(refs).intersection(plan.columns) | {plan.id_column.ref, sort_ref}
+        if (projection := plan.projections.get(key)) is None:
+            if len(key) == len(plan.columns):
+                projection = (plan.select_columns, plan.row_type)
+            else:
+                columns = [col for ref, col in plan.columns.items() if ref in key]
+                projection = (
+                    tuple(col.src for col in columns),
+                    ResolvedRow.make_type(f"{self.model.__name__}Row", [col.ref for col in columns]),
+                )
+            plan.projections[key] = projection
+        return projection
 
-    def __resolve_model_attributes(self, resource: "Resource") -> dict[str, __ListColumns]:
-        """Generates a dictionary of all columns which can be used within the model"""
+    @staticmethod
+    def __python_type(src: Any) -> Callable[[Any], Any] | None:
+        try:
+            return src.expression.type.python_type
+        except NotImplementedError:
+            return None
+
+    def __compile_plan(self, resource: "Resource") -> __ResolutionPlan:
+        """Collects all columns which can be used within the model into a resolution plan"""
         manager = manager_of_class(self.model)
         # noinspection PyProtectedMember,PyTypeChecker
         all_keys: frozenset = manager._all_key_set
@@ -71,12 +181,21 @@ class SQLAlchemyResolver(ResolverBase):
                 print("Deffered, skipping", attr, attr.property)
                 continue
 
-            all_columns[name] = self.__ListColumns(ref=name, src=attr, sortable=True)
+            all_columns[name] = self.__ListColumns(
+                ref=name,
+                src=attr,
+                python_type=self.__python_type(attr),
+                sortable=True,
+                nullable=any(getattr(col, "nullable", True) for col in attr.property.columns),
+            )
 
         # parse additional columns provided by the user
         for name, column in self.extra_cols.items():
             if isinstance(column, Query | ColumnElement | InstrumentedAttribute):
-                all_columns[name] = self.__ListColumns(ref=name, src=column.label(name), sortable=False)
+                src = column.label(name)
+                all_columns[name] = self.__ListColumns(
+                    ref=name, src=src, python_type=self.__python_type(src), sortable=False, extra=True
+                )
 
             else:
                 raise ValueError(f"Invalid column type for {name}: {column}")
@@ -84,7 +203,16 @@ class SQLAlchemyResolver(ResolverBase):
         assert all_columns, "No columns found in the model"
         assert all_columns.get(resource.id_col), "ID column not found in the model"
 
-        return all_columns
+        return self.__ResolutionPlan(
+            columns=all_columns,
+            id_column=all_columns[resource.id_col],
+            select_columns=tuple(col.src for col in all_columns.values()),
+            filter_options={
+                ref: ResolverBase.FilterOption(reference=ref, display=col.src.description or ref)
+                for ref, col in all_columns.items()
+            },
+            row_type=ResolvedRow.make_type(f"{self.model.__name__}Row", list(all_columns)),
+        )
 
     @staticmethod
     def __generate_filter_expression(
@@ -102,12 +230,13 @@ class SQLAlchemyResolver(ResolverBase):
                 continue
 
             # convert value to the correct type
+            cast_value = attributes[f.ref].python_type or (lambda x: x)
             if f.op == "in":
                 value = ast.literal_eval(f.val or "[]")
                 assert isinstance(value, list | tuple), f'Invalid value type "{value}", must be List'
-                value = [sql_column.expression.type.python_type(x) for x in value]
+                value = [cast_value(x) for x in value]
             else:
-                value = sql_column.expression.type.python_type(f.val)
+                value = cast_value(f.val)
 
             if (f.op == "like" or f.op == "ilike") and "%" not in value:
                 value = f"%{value}%"
@@ -121,22 +250,94 @@ class SQLAlchemyResolver(ResolverBase):
 
             yield op(value)
 
-    def _make_entity(self, entry: Row[tuple[Any]], attributes: dict[str, __ListColumns]) -> dict[str, str]:
-        """Returns entity which can be used as both class and dict"""
-        obj = {key: value for value, key in zip(entry, attributes.keys())}
-
-        class ModelOverwrite(self.model):  # type: ignore[name-defined]
-            __abstract__ = True
+    @staticmethod
+    def __seek_expression(
+        sort_column: __ListColumns,
+        id_column: __ListColumns,
+        values: tuple[Any, ...],
+        descending: bool,
+        nulls_last: bool,
+    ) -> ColumnElement[bool]:
+        """
+        Filters entries placed after the (sort value, id) pair in the traversed order,
+        NULLs of the sort column are placed after (`nulls_last`) or before all other values
+        """
+        sort_value, id_value = values
+        after = operator.lt if descending else operator.gt
+
+        if sort_column is id_column:
+            return after(id_column.src, id_value)
+
+        if sort_value is None:
+            # boundary is within the NULLs, which are ordered only by id
+            within_nulls = and_(sort_column.src.is_(None), after(id_column.src, id_value))
+            return within_nulls if nulls_last else or_(within_nulls, sort_column.src.is_not(None))
+
+        seek = or_(
+            after(sort_column.src, sort_value),
+            and_(sort_column.src == sort_value, after(id_column.src, id_value)),
+        )
+        if nulls_last and sort_column.nullable:
+            return or_(seek, sort_column.src.is_(None))
+        return seek
 
-            def __getitem__(self, item):
-                return obj[item]
+    async def __run(self, fn: Callable[[Session], _T]) -> _T:
+        """Runs `fn` within a new session, async sessions run it through `run_sync`"""
+        if self.async_session_maker:
+            async with self.async_session_maker() as async_session:
+                return await async_session.run_sync(fn)
+        elif self.session_maker:
+            with self.session_maker() as session:
+                return fn(session)
+        raise RuntimeError("No session maker provided")
 
-            def get(self, *args, **kwargs):
-                return obj.get(*args, **kwargs)
+    @staticmethod
+    def __count_exact(session: Session, base_select: Select) -> int:
+        return session.execute(select(count()).select_from(base_select.subquery())).scalar() or 0
+
+    def __count_estimated(self, session: Session, base_select: Select, filtered: bool) -> int | None:
+        """Estimate of the total from the planner statistics, None when the database cannot provide one"""
+        dialect = session.get_bind().dialect
+        try:
+            if dialect.name == "postgresql":
+                sql = base_select.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+                explained: Any
+                with session.begin_nested():
+                    explained = session.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+                if isinstance(explained, str):
+                    explained = json.loads(explained)
+                return int(explained[0]["Plan"]["Plan Rows"])
+
+            if dialect.name == "sqlite" and not filtered:
+                # SQLite cannot estimate arbitrary queries, table statistics are used as a stand-in
+                table = cast(Table, self.model.__table__)
+                try:
+                    stat = session.execute(
+                        text("SELECT stat FROM sqlite_stat1 WHERE tbl = :tbl LIMIT 1"), {"tbl": table.name}
+                    ).scalar()
+                except OperationalError:
+                    stat = None  # ANALYZE has never been run
+                if stat:
+                    return int(stat.split()[0])
+                return session.execute(select(func.max(literal_column("rowid"))).select_from(table)).scalar() or 0
+        except (SQLAlchemyError, LookupError, TypeError, ValueError) as e:
+            logging.warning(f"Failed estimating count of {self.model.__name__}, falling back to exact count: {e}")
+
+        return None
+
+    def __cached_count(self, key: tuple) -> int | None:
+        entry = self.__count_cache.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
 
-        entity = ModelOverwrite(**{k: v for k, v in obj.items() if k in dir(self.model)})
-        # make_transient_to_detached(entity)
-        return cast(dict[str, str], entity)
+    def __store_count(self, key: tuple, total: int) -> None:
+        now = time.monotonic()
+        if len(self.__count_cache) >= self.count_cache_size:
+            self.__count_cache = {k: v for k, v in self.__count_cache.items() if v[0] >= now}
+        while len(self.__count_cache) >= self.count_cache_size:
+            del self.__count_cache[next(iter(self.__count_cache))]
+        self.__count_cache[key] = (now + self.count_cache_ttl, total)
 
     async def resolve_list(
         self,
@@ -145,48 +346,172 @@ class SQLAlchemyResolver(ResolverBase):
         per_page: int,
         filters: list[ResolverBase.AppliedFilter],
         sort: tuple[str, Literal["asc", "desc"]],
+        pagination: Literal["offset", "cursor"] = "offset",
+        cursor: str | None = None,
+        count_strategy: CountStrategy | None = None,
+        refs: Collection[str] | None = None,
     ) -> ResolverBase.ResolvedListData:
-        attributes = self.__resolve_model_attributes(resource)
+        plan = self.__resolution_plan(resource)
+        attributes = plan.columns
+        sort_column = attributes[sort[0]]
+        strategy = count_strategy or self.count_strategy
+        select_columns, row_type = self.__projection(plan, refs, sort_column.ref)
+
+        # extra columns can be computed only for the entries on the page, unless the list is filtered
+        # or sorted by them, in which case the database has to compute them for all entries anyway
+        # extra columns may be anywhere within the row, as they can replace model columns of the same name
+        scan_indexes = [i for i, ref in enumerate(row_type._fields) if not attributes[ref].extra]
+        late_indexes = [i for i, ref in enumerate(row_type._fields) if attributes[ref].extra]
+        late_extra_cols = (
+            self.late_extra_cols
+            and bool(late_indexes)
+            and not plan.id_column.extra
+            and not sort_column.extra
+            and not any(attributes[f.ref].extra for f in filters)
+        )
+        if late_extra_cols:
+            scan_columns = tuple(select_columns[i] for i in scan_indexes)
+            id_index = scan_indexes.index(row_type._fields.index(plan.id_column.ref))
+            # scanned values followed by late values are put back into the order of the row
+            placement = {row_index: i for i, row_index in enumerate(scan_indexes + late_indexes)}
+            to_row_order = operator.itemgetter(*(placement[i] for i in range(len(row_type._fields))))
+        else:
+            scan_columns = select_columns
 
-        select_sort = getattr(attributes[sort[0]].src, sort[1])()
         filter_expressions = self.__generate_filter_expression(attributes, filters)
 
         # generate the query which will be executed
-        base_select = select(*[col.src for col in attributes.values()]).filter(*filter_expressions)
-        list_select = base_select.limit(per_page).offset((page - 1) * per_page).order_by(select_sort)
-
-        # execute queries
-        if self.async_session_maker:
-            async with self.async_session_maker() as session:
-                total = await session.scalar(select(count()).select_from(base_select.subquery()))
-                rows = (await session.execute(list_select)).fetchall()
-        elif self.session_maker:
-            with self.session_maker() as session:
-                total = session.execute(select(count()).select_from(base_select.subquery())).scalar()
-                rows = session.execute(list_select).fetchall()
+        base_select = select(*scan_columns).filter(*filter_expressions)
+
+        seek = self.Cursor.decode(cursor) if cursor and pagination == "cursor" else None
+        if seek is not None and seek.sort != tuple(sort):
+            # sorting has changed since the cursor was generated, start from the beginning
+            seek, page = None, 1
+
+        if pagination == "cursor":
+            # previous page is fetched by traversing the list in the opposite order
+            backward = seek is not None and seek.direction == "prev"
+            descending = (sort[1] == "desc") != backward
+            order = (lambda c: c.desc()) if descending else (lambda c: c.asc())
+            list_select = base_select
+            if sort_column.nullable and sort_column is not plan.id_column:
+                # NULLs are at the end of the list, the same way in every database
+                is_null = sort_column.src.is_(None)
+                list_select = list_select.order_by(is_null.desc() if backward else is_null.asc())
+            list_select = list_select.order_by(order(sort_column.src))
+            if sort_column is not plan.id_column:
+                list_select = list_select.order_by(order(plan.id_column.src))
+
+            if seek is not None:
+                list_select = list_select.filter(
+                    self.__seek_expression(sort_column, plan.id_column, seek.values, descending, not backward)
+                )
+            else:
+                list_select = list_select.offset((page - 1) * per_page)
         else:
-            raise RuntimeError("No session maker provided")
+            select_sort = getattr(sort_column.src, sort[1])()
+            list_select = base_select.offset((page - 1) * per_page).order_by(select_sort)
+
+        # one extra entry tells us if there is another page in the traversed direction
+        fetch_extra = pagination == "cursor" or strategy == "has_more"
+        list_select = list_select.limit(per_page + 1 if fetch_extra else per_page)
+
+        # window count over seeked query would count only the remaining entries
+        window = strategy == "window" and seek is None
+        if window:
+            list_select = list_select.add_columns(count().over().label("_admin_table_total"))
+
+        count_key = (resource.name, tuple((f.ref, f.op, f.val) for f in filters))
+        cached_total = self.__cached_count(count_key) if strategy == "cached" else None
+
+        def fetch_rows(session: Session) -> Sequence[Sequence[Any]]:
+            rows = session.execute(list_select).fetchall()
+            if not late_extra_cols or not rows:
+                return rows
+
+            # second query computes extra columns just for the ids on the page
+            id_src = plan.id_column.src
+            extra_select = select(id_src, *(select_columns[i] for i in late_indexes)).filter(
+                id_src.in_([row[id_index] for row in rows])
+            )
+            extra_values = {extra[0]: tuple(extra[1:]) for extra in session.execute(extra_select)}
+            missing = (None,) * len(late_indexes)
+            scanned = len(scan_indexes)
+            # columns past the scanned ones (window total) stay at the end
+            return [
+                (*to_row_order((*row[:scanned], *extra_values.get(row[id_index], missing))), *row[scanned:])
+                for row in rows
+            ]
+
+        def fetch_total(session: Session) -> tuple[int, CountStrategy]:
+            if strategy == "estimated":
+                estimate = self.__count_estimated(session, base_select, filtered=bool(filters))
+                if estimate is not None:
+                    return estimate, "estimated"
+
+            total = self.__count_exact(session, base_select)
+            if strategy == "cached":
+                self.__store_count(count_key, total)
+            return total, "exact"
+
+        total: int | None
+        total_mode: CountStrategy
+        if cached_total is not None or strategy == "has_more" or window:
+            # total is known or comes from the page itself, page query runs alone
+            rows = await self.__run(fetch_rows)
+            total, total_mode = (cached_total, "cached") if cached_total is not None else (None, strategy)
+        elif self.concurrent_count and self.async_session_maker:
+            # separate sessions check out separate pooled connections, so both queries run at the same time
+            rows, (total, total_mode) = await asyncio.gather(self.__run(fetch_rows), self.__run(fetch_total))
+        else:
+            rows, (total, total_mode) = await self.__run(lambda session: (fetch_rows(session), fetch_total(session)))
 
-        list_data: list[dict[str, str]] = []
+        if window:
+            if rows or page == 1:
+                total = rows[0][-1] if rows else 0
+            else:
+                # page is past the end, there is no row to read the total from
+                total, total_mode = await self.__run(fetch_total)
+            rows = [row[:-1] for row in rows]
+
+        list_data: list[ResolvedData] = [row_type(row) for row in rows[:per_page]]
+        has_next = has_prev = False
+        if seek is not None and seek.direction == "prev":
+            list_data.reverse()
+            has_next, has_prev = bool(list_data), len(rows) > per_page
+        elif fetch_extra:
+            has_next, has_prev = len(rows) > per_page, bool(list_data) and (seek is not None or page > 1)
+
+        pagination_data: dict[
+            Literal["page", "per_page", "total", "total_mode", "has_more", "next_cursor", "prev_cursor"], Any
+        ] = {
+            "page": page,
+            "per_page": per_page,
+            # without counting, total is the lower bound covering the next page if there is one
+            "total": total if total is not None else (page - 1) * per_page + len(list_data) + has_next,
+            "total_mode": total_mode,
+        }
 
-        for row in rows:
-            entity = self._make_entity(row, attributes)
-            list_data.append(cast(dict[str, str], entity))  # type: ignore
+        if strategy == "has_more":
+            pagination_data["has_more"] = has_next
 
-        # parse data into a dictionary
-        return self.ResolvedListData(
-            list_data=list_data,
-            pagination={"page": page, "per_page": per_page, "total": total or 0},
-        )
+        if pagination == "cursor":
+
+            def make_cursor(row: ResolvedData, direction: Literal["next", "prev"]) -> str:
+                return self.Cursor(sort=sort, direction=direction, values=(row[sort[0]], row[resource.id_col])).encode()
+
+            pagination_data["next_cursor"] = make_cursor(list_data[-1], "next") if has_next else None
+            pagination_data["prev_cursor"] = make_cursor(list_data[0], "prev") if has_prev else None
+
+        return self.ResolvedListData(list_data=list_data, pagination=pagination_data)
 
     async def resolve_detail(self, resource: "Resource", entry_id: str) -> ResolvedData | None:
         """Resolve data of a single entry"""
-        attributes = self.__resolve_model_attributes(resource)
-        assert resource.id_col in attributes, f'Model does not have id col: "{resource.id_col}'
-        col_src: InstrumentedAttribute = attributes[resource.id_col].src
-        casted_id = col_src.type.python_type(entry_id)
+        plan = self.__resolution_plan(resource)
+        col_src: InstrumentedAttribute = plan.id_column.src
+        casted_id = plan.id_column.python_type(entry_id) if plan.id_column.python_type else entry_id
 
-        base_select = select(*[col.src for col in attributes.values()]).filter(col_src == casted_id).limit(1)
+        base_select = select(*plan.select_columns).filter(col_src == casted_id).limit(1)
 
         if self.async_session_maker:
             async with self.async_session_maker() as session:
@@ -200,16 +525,10 @@ class SQLAlchemyResolver(ResolverBase):
         if entry is None:
             return None
 
-        entity = self._make_entity(entry, attributes)
-        return entity  # type: ignore
+        return plan.row_type(entry)
 
-    def get_filter_options(self, resource: "Resource") -> dict[str, ResolverBase.FilterOption]:
-        all_columns = self.__resolve_model_attributes(resource)
+    def get_refs(self, resource: "Resource") -> Collection[str] | None:
+        return self.__resolution_plan(resource).columns.keys()
 
-        return {
-            ref: ResolverBase.FilterOption(
-                reference=ref,
-                display=col.src.description or ref,
-            )
-            for ref, col in all_columns.items()
-        }
+    def get_filter_options(self, resource: "Resource") -> dict[str, ResolverBase.FilterOption]:
+        return self.__resolution_plan(resource).filter_options
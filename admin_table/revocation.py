@@ -0,0 +1,156 @@
+import abc
+import asyncio
+import hashlib
+import heapq
+import math
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+
+class RevocationStoreBase(abc.ABC):
+    """Revoked refresh tokens, keyed by the `jti` claim and kept until the token would expire anyway"""
+
+    @abc.abstractmethod
+    async def revoke(self, jwt_id: str, expiry: datetime) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def is_revoked(self, jwt_id: str) -> bool:
+        raise NotImplementedError()
+
+
+class MemoryRevocationStore(RevocationStoreBase):
+    """Revocations held by the current process only, expired entries are pruned on every revocation"""
+
+    def __init__(self):
+        self._revoked: dict[str, float] = {}
+        self._expiries: list[tuple[float, str]] = []
+
+    async def revoke(self, jwt_id: str, expiry: datetime) -> None:
+        now = time.time()
+        while self._expiries and self._expiries[0][0] <= now:
+            _, expired = heapq.heappop(self._expiries)
+            self._revoked.pop(expired, None)
+
+        expires_at = expiry.timestamp()
+        self._revoked[jwt_id] = expires_at
+        heapq.heappush(self._expiries, (expires_at, jwt_id))
+
+    async def is_revoked(self, jwt_id: str) -> bool:
+        return jwt_id in self._revoked
+
+
+class BloomFilter:
+    """Set membership with false positives but no false negatives, sized for `capacity` items"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _indexes(self, item: str):
+        # double hashing, two 64 bit halves of one digest give all k positions
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for index in self._indexes(item):
+            self._bits[index >> 3] |= 1 << (index & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[index >> 3] & (1 << (index & 7)) for index in self._indexes(item))
+
+
+class SQLiteRevocationStore(RevocationStoreBase):
+    """
+    Revocations stored in a SQLite file, which can be shared by all worker processes on the host.
+
+    Every process keeps a bloom filter of revoked ids, so checking a token which was not revoked does not query
+    the database. The filter is updated with new revocations only when the file change counter in the database
+    header differs from the last seen one, which costs a single read of 4 bytes.
+    Queries may wait up to 10 seconds for a lock held by another process, so they run in a worker thread
+    and never block the event loop.
+    """
+
+    # offset of the "file change counter" in the SQLite database header, incremented by every write transaction
+    _CHANGE_COUNTER_OFFSET = 24
+
+    def __init__(self, path: str, capacity: int = 100_000):
+        self.path = path
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+        # change counter is maintained only in rollback journal mode
+        self._connection.execute("PRAGMA journal_mode=DELETE")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS revoked_tokens"
+            " (id INTEGER PRIMARY KEY AUTOINCREMENT, jwt_id TEXT NOT NULL UNIQUE, expires_at REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS revoked_tokens_expires_at ON revoked_tokens (expires_at)")
+        self._fd = os.open(path, os.O_RDONLY)
+
+        self._bloom = BloomFilter(capacity)
+        self._last_id = 0
+        self._change_counter = b""
+        self._sync()
+
+    def _sync(self) -> None:
+        """Add revocations written since the last sync (by any process) to the bloom filter"""
+        change_counter = os.pread(self._fd, 4, self._CHANGE_COUNTER_OFFSET)
+        if change_counter == self._change_counter:
+            return
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, jwt_id FROM revoked_tokens WHERE id > ? ORDER BY id", (self._last_id,)
+            ).fetchall()
+            if self._bloom.count + len(rows) > self._bloom.capacity:
+                # filter is full, rebuild it from the entries which did not expire yet
+                self._bloom = BloomFilter(max(self.capacity, 2 * (self._bloom.count + len(rows))))
+                rows = self._connection.execute(
+                    "SELECT id, jwt_id FROM revoked_tokens WHERE expires_at > ? ORDER BY id", (time.time(),)
+                ).fetchall()
+            for row_id, jwt_id in rows:
+                self._bloom.add(jwt_id)
+                self._last_id = max(self._last_id, row_id)
+            self._change_counter = change_counter
+
+    def _changed(self) -> bool:
+        return os.pread(self._fd, 4, self._CHANGE_COUNTER_OFFSET) != self._change_counter
+
+    def _revoke(self, jwt_id: str, expires_at: float) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM revoked_tokens WHERE expires_at <= ?", (time.time(),))
+            self._connection.execute(
+                "INSERT OR IGNORE INTO revoked_tokens (jwt_id, expires_at) VALUES (?, ?)", (jwt_id, expires_at)
+            )
+        self._sync()
+
+    def _lookup(self, jwt_id: str) -> bool:
+        with self._lock:
+            row = self._connection.execute("SELECT 1 FROM revoked_tokens WHERE jwt_id = ?", (jwt_id,)).fetchone()
+        return row is not None
+
+    async def revoke(self, jwt_id: str, expiry: datetime) -> None:
+        await asyncio.to_thread(self._revoke, jwt_id, expiry.timestamp())
+
+    async def is_revoked(self, jwt_id: str) -> bool:
+        # unchanged database and a bloom filter miss are answered without leaving the event loop
+        if self._changed():
+            await asyncio.to_thread(self._sync)
+        if jwt_id not in self._bloom:
+            return False
+
+        # possibly revoked, only now the database is asked
+        return await asyncio.to_thread(self._lookup, jwt_id)
+
+    def close(self) -> None:
+        os.close(self._fd)
+        self._connection.close()
@@ -0,0 +1,113 @@
+import asyncio
+import sys
+import traceback
+from collections import deque
+from collections.abc import AsyncIterator
+from types import TracebackType
+
+from .config import LiveDataManagerBase, LiveDataSettings, SharedLiveDataManagerBase
+from .live_data import LiveDataTopicStats
+
+
+class SharedLiveDataDispatcher:
+    """
+    Runs the single upstream of a shared live-data manager and dispatches its events to the registered topics.
+    Upstream is opened with the first registered topic and kept open, until it fails or ends.
+    """
+
+    def __init__(self, manager: SharedLiveDataManagerBase):
+        self.manager = manager
+        # topic -> its running producer
+        self.topics: dict[str, SharedLiveDataTopic] = {}
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    def topic(self, topic: str, stats: LiveDataTopicStats | None = None) -> "SharedLiveDataTopic":
+        return SharedLiveDataTopic(self, topic, stats)
+
+    async def register(self, producer: "SharedLiveDataTopic") -> None:
+        async with self._lock:
+            if self._task is None or self._task.done():
+                opened = asyncio.get_running_loop().create_future()
+                self._task = asyncio.create_task(self._run(opened))
+                await opened
+
+            # producer of the topic which is just stopping is replaced, upstream is already registered
+            previous = self.topics.get(producer.topic)
+            self.topics[producer.topic] = producer
+            if previous is None:
+                await self.manager.register(producer.topic)
+
+    async def unregister(self, producer: "SharedLiveDataTopic") -> None:
+        async with self._lock:
+            if self.topics.get(producer.topic) is producer:
+                del self.topics[producer.topic]
+                await self.manager.unregister(producer.topic)
+
+    async def _run(self, opened: asyncio.Future) -> None:
+        try:
+            async with self.manager as events:
+                opened.set_result(None)
+                async for event in events:
+                    if (producer := self.topics.get(event.topic)) is not None:
+                        producer.put(event)
+        except Exception as e:
+            if opened.done():
+                traceback.print_exc(file=sys.stderr)
+            else:
+                opened.set_exception(e)
+        finally:
+            if not opened.done():
+                opened.cancel()
+            # upstream is gone, producers stop and new subscribers open the upstream again
+            for producer in self.topics.values():
+                producer.put(None)
+            self.topics.clear()
+
+
+class SharedLiveDataTopic(LiveDataManagerBase):
+    """Single topic of a shared live-data manager, used by the application as a manager of the topic"""
+
+    def __init__(self, dispatcher: SharedLiveDataDispatcher, topic: str, stats: LiveDataTopicStats | None = None):
+        super().__init__(topic)
+        self.dispatcher = dispatcher
+        for setting in LiveDataSettings.__annotations__:
+            setattr(self, setting, getattr(dispatcher.manager, setting))
+        self.stats = stats if stats is not None else LiveDataTopicStats()
+
+        # events waiting for the topic task, None when the upstream ended
+        self._events: deque[SharedLiveDataManagerBase.DataEvent | None] = deque()
+        self._ready = asyncio.Event()
+
+    def put(self, event: SharedLiveDataManagerBase.DataEvent | None) -> None:
+        # topic task falls behind the upstream, events are dropped by the overflow policy and counted
+        if event is not None and len(self._events) >= self.queue_size:
+            if self.overflow == "keep_latest":
+                self.stats.upstream_dropped += len(self._events)
+                self._events.clear()
+            else:
+                # there is no client to disconnect here, 'disconnect' drops the oldest event too
+                self.stats.upstream_dropped += 1
+                self._events.popleft()
+        self._events.append(event)
+        self._ready.set()
+
+    async def __aenter__(self) -> AsyncIterator[SharedLiveDataManagerBase.DataEvent]:
+        await self.dispatcher.register(self)
+        return self._iterate()
+
+    async def __aexit__(
+        self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None
+    ) -> bool | None:
+        await self.dispatcher.unregister(self)
+        return None
+
+    async def _iterate(self) -> AsyncIterator[SharedLiveDataManagerBase.DataEvent]:
+        while True:
+            if not self._events:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            if (event := self._events.popleft()) is None:
+                return
+            yield event
@@ -1,32 +1,34 @@
 import sys
 import traceback
-from collections.abc import Awaitable
-from datetime import datetime
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import asynccontextmanager
 from typing import Any
 
 from fastapi import Body, FastAPI, Request
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import Response
 from starlette.types import Receive, Scope, Send
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
+from .._json import encode_json
 from ..application import URL, AdminTableRoute, AdminTableWebsocket
 from ._base import BaseWrapper
 
-custom_encoder = {
-    datetime: lambda dt: dt.strftime("%Y-%m-%d %H:%M:%S"),
-}
-
 
 class FastAPIWrapper(BaseWrapper):
     fa: FastAPI
 
     def __init__(self, *args, **kwargs):
-        self.fa = FastAPI()
+        self.fa = FastAPI(lifespan=self._lifespan)
         super().__init__(*args, **kwargs)
 
         self.register_all()
 
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI) -> AsyncIterator[None]:
+        # not run when the application is mounted, websockets start warm topics on accept as well
+        await self.admin_table.live_data_start_warm_topics()
+        yield
+
     def register_route_callback(self, route: AdminTableRoute) -> None:
         async def callback(request: Request, payload: Any = Body(None)) -> Any:
             # create payload for route handler
@@ -53,26 +55,22 @@ class FastAPIWrapper(BaseWrapper):
                 raise
 
             # process handler response
-            if isinstance(response, str):
+            if isinstance(response, str | bytes):
                 return Response(content=response, media_type=route.content_type)
             if isinstance(response, dict):
-                return JSONResponse(content=jsonable_encoder(response, custom_encoder=custom_encoder))
+                return Response(content=encode_json(response), media_type="application/json")
             if isinstance(response, AdminTableRoute.RouteResponse):
                 content_type = response.headers.get("content-type", None) or response.content_type or route.content_type
-                handler_response: JSONResponse | Response
-                if content_type == "application/json":
-                    handler_response = JSONResponse(
-                        content=jsonable_encoder(response.body, custom_encoder=custom_encoder),
-                        headers=response.headers,
-                        status_code=response.status_code,
-                    )
-                else:
-                    handler_response = Response(
-                        content=response.body,
-                        headers=response.headers,
-                        status_code=response.status_code,
-                        media_type=content_type,
-                    )
+                # bodies of json responses are encoded in one pass, unless the handler already encoded them
+                content = response.body
+                if content_type == "application/json" and not isinstance(content, bytes):
+                    content = encode_json(content)
+                handler_response = Response(
+                    content=content,
+                    headers=response.headers,
+                    status_code=response.status_code,
+                    media_type=content_type,
+                )
                 for cookie in response.cookies:
                     handler_response.set_cookie(**cookie)
                 return handler_response
@@ -97,6 +95,8 @@ class FastAPIWrapper(BaseWrapper):
                 accept=ws.accept,
                 receive_json=ws.receive_json,
                 send_json=ws.send_json,
+                send_text=ws.send_text,
+                send_bytes=ws.send_bytes,
                 close=ws.close,
             )
 
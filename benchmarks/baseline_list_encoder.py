@@ -0,0 +1,238 @@
+"""
+List encoding as done by `resource_list_handler` before the list encoder was compiled per view,
+copied verbatim from `admin_table/application.py` to serve as the benchmark baseline.
+Batch computed columns are left out, the benchmark does not use them.
+"""
+
+import asyncio
+import sys
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from typing import Any, Literal
+from urllib.parse import quote
+
+from sqlalchemy.orm import InstrumentedAttribute
+
+from admin_table.config import Computed, LinkDetail, LinkTable, ListView, LiveValue, Resource
+
+
+class _Column:
+    def __init__(self, *, ref: str, display: str, sortable: bool, description: str | None = None, **kwargs):
+        self.ref = ref
+        self.display = display
+        self.sortable = sortable
+        self.description = description
+
+        # refs which have to be resolved to compute the value, None when the column needs the full row
+        self.refs: frozenset[str] | None = frozenset({ref} if ref else ())
+
+    async def value(self, row):
+        # we do not perform check on purpose here, to let the application die
+        # in case of programming error, that should be more noticable than screaming
+        # errors into the command line
+        return row[self.ref]
+
+    async def values(self, rows: Sequence[Any], limiter: asyncio.Semaphore) -> list[Any]:
+        """Values of the column for all rows on the page, `limiter` bounds concurrent awaits of async handlers"""
+        return [await self.value(row) for row in rows]
+
+    async def head(self, current_sort: tuple[str, Literal["asc", "desc"]] | None = None):
+        sort = None
+        if current_sort:
+            sort = current_sort[1] if current_sort[0] == self.ref else None
+        return {
+            "ref": self.ref,
+            "display": self.display,
+            "sortable": self.sortable,
+            "sort": sort,
+            "description": self.description,
+        }
+
+
+class _LinkDetailColumn(_Column):
+    def __init__(self, resource, id_ref, **kwargs):
+        super().__init__(**kwargs)
+        self.resource = resource
+        self.id_ref = id_ref
+        self.refs = frozenset({*(self.refs or ()), id_ref})
+
+    async def value(self, row):
+        return {
+            "type": "link",
+            "kind": "detail",
+            "resource": self.resource,
+            "value": await super().value(row),
+            "id": row[self.id_ref],
+            "href": f"/resource/{quote(self.resource)}/detail/{row[self.id_ref]}",
+        }
+
+
+class _LinkTableColumn(_Column):
+    def __init__(self, resource, filter_col, filter_op, filter_ref, **kwargs):
+        super().__init__(**kwargs)
+        self.resource = resource
+        self.filter_col = filter_col
+        self.filter_op = filter_op
+        self.filter_ref = filter_ref
+        self.refs = frozenset({*(self.refs or ()), filter_ref})
+
+    async def value(self, row):
+        return {
+            "type": "link",
+            "kind": "table",
+            "resource": self.resource,
+            "value": await super().value(row),
+            "filter": {"col": self.filter_col, "op": self.filter_op, "val": row[self.filter_ref]},
+            "href": f"/resource/{quote(self.resource)}/list"
+            f"?filter={self.filter_col};{self.filter_op};{row[self.filter_ref]}",
+        }
+
+
+class _ComputedColumn(_Column):
+    def __init__(
+        self, handler: Callable[[Any], str | Any | Awaitable[str | Any]], refs: Sequence[str] | None = None, **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.handler = handler
+        self.refs = frozenset(refs) if refs is not None else None
+
+    async def value(self, row):
+        try:
+            if asyncio.iscoroutinefunction(self.handler):
+                value = await self.handler(row)
+            else:
+                value = self.handler(row)
+        except Exception as e:
+            print(f"Failed computing {self}: {e}", file=sys.stderr)
+            value = "# ERROR #"
+
+        return value
+
+    async def values(self, rows: Sequence[Any], limiter: asyncio.Semaphore) -> list[Any]:
+        if not asyncio.iscoroutinefunction(self.handler):
+            return await super().values(rows, limiter)
+
+        async def limited_value(row):
+            async with limiter:
+                return await self.value(row)
+
+        return list(await asyncio.gather(*(limited_value(row) for row in rows)))
+
+
+class _LiveValueColumn(_Column):
+    def __init__(self, initial_value_ref: str | None, topic_ref: str, history: bool, **kwargs):
+        self.initial_value_ref = initial_value_ref
+        self.topic_ref = topic_ref
+        self.history = history
+        super().__init__(**kwargs)
+        self.refs = frozenset({topic_ref, *([initial_value_ref] if initial_value_ref else [])})
+
+    async def value(self, row):
+        return {
+            "type": "live",
+            "initial": row[self.initial_value_ref] if self.initial_value_ref else None,
+            "topic": row[self.topic_ref],
+            "history": self.history,
+        }
+
+
+def field_resolver(fields) -> Iterable[_Column]:
+    for field in fields:
+        # pattern match on the field type
+        handler: Callable[[Any], Any | Awaitable[Any]]
+        match field:
+            # field is string
+            case ref if isinstance(ref, str):
+                yield _Column(display=ref, ref=ref, sortable=True)
+                # TODO check if ref is a valid column in the model
+            case ref if isinstance(ref, InstrumentedAttribute):
+                yield _Column(display=ref.key, ref=ref.key, sortable=True)
+            case [display, ref] if isinstance(ref, str):
+                # TODO check if ref is a valid column in the model
+                yield _Column(ref=ref, display=display, sortable=True)
+            case [display, ref] if isinstance(ref, InstrumentedAttribute):
+                yield _Column(ref=ref.key, display=display, sortable=True)
+            case [display, handler] if callable(handler):
+                yield _ComputedColumn(handler, ref=None, display=display, sortable=False)
+            case [display, ref] if isinstance(ref, Computed):
+                yield _ComputedColumn(ref.handler, ref.refs, ref=None, display=display, sortable=False)
+            case [display, ref] if isinstance(ref, LinkDetail):
+                yield _LinkDetailColumn(ref.resource, ref.id_ref, ref=ref.ref, display=display, sortable=True)
+            case [display, ref] if isinstance(ref, LinkTable):
+                yield (
+                    _LinkTableColumn(
+                        ref.resource,
+                        ref.filter_col,
+                        ref.filter_op,
+                        ref.filter_ref,
+                        ref=ref.ref,
+                        display=display,
+                        sortable=True,
+                    )
+                )
+            case [display, ref] if isinstance(ref, LiveValue):
+                yield _LiveValueColumn(
+                    ref.initial_ref, ref.ref, ref.history, ref=ref.initial_ref, display=display, sortable=True
+                )
+
+            # same cases, but now with description
+            # I did not come up with a better way to do this unfortunately
+            case [display, description, ref] if isinstance(ref, str):
+                yield _Column(display=display, ref=ref, sortable=True, description=description)
+            case [display, description, ref] if isinstance(ref, InstrumentedAttribute):
+                yield _Column(display=display, ref=ref.key, sortable=True, description=description)
+            case [display, description, handler] if callable(handler):
+                yield _ComputedColumn(handler, ref=None, display=display, sortable=False, description=description)
+            case [display, description, ref] if isinstance(ref, Computed):
+                yield _ComputedColumn(
+                    ref.handler, ref.refs, ref=None, display=display, sortable=False, description=description
+                )
+            case [display, description, ref] if isinstance(ref, LinkDetail):
+                yield _LinkDetailColumn(
+                    ref.resource, ref.id_ref, ref=ref.ref, display=display, sortable=True, description=description
+                )
+            case [display, description, ref] if isinstance(ref, LinkTable):
+                yield (
+                    _LinkTableColumn(
+                        ref.resource,
+                        ref.filter_col,
+                        ref.filter_op,
+                        ref.filter_ref,
+                        ref=ref.ref,
+                        display=display,
+                        sortable=True,
+                        description=description,
+                    )
+                )
+            case [display, description, ref] if isinstance(ref, LiveValue):
+                yield _LiveValueColumn(
+                    ref.initial_ref,
+                    ref.ref,
+                    ref.history,
+                    ref=ref.initial_ref,
+                    display=display,
+                    sortable=False,
+                    description=description,
+                )
+
+            case _:
+                raise ValueError(f"Invalid field definition: {field}")
+
+
+async def encode(resource: Resource, view: ListView, rows: Sequence[Any], computed_concurrency: int = 16) -> list:
+    """Header built for every request, every column computed for the whole page, then zipped into rows"""
+    header: list[_Column] = []
+    if resource.views.detail is not None:
+        header.append(
+            _LinkDetailColumn(
+                resource=resource.name,
+                id_ref=resource.id_col,
+                ref=view.detail_value_ref or resource.id_col,
+                display="Detail",
+                sortable=True,
+            )
+        )
+    header.extend(field_resolver(view.fields))
+
+    limiter = asyncio.Semaphore(computed_concurrency)
+    columns = await asyncio.gather(*(h.values(rows, limiter) for h in header))
+    return [list(row) for row in zip(*columns)]
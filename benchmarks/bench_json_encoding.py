@@ -0,0 +1,74 @@
+#! /usr/bin/env python3
+"""
+Cost of encoding a list page response body to JSON bytes.
+
+Compares the previous approach (`jsonable_encoder` copy followed by `JSONResponse` rendering)
+with the single pass encoder used by `FastAPIWrapper`, using orjson too when it is installed.
+
+    poetry run python -m benchmarks.bench_json_encoding
+"""
+
+import timeit
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from admin_table import _json
+
+ROWS = 2000
+REPEAT = 20
+
+
+def list_page_body() -> dict:
+    now = datetime.now()
+    rows = []
+    for x in range(ROWS):
+        user_id = uuid.uuid4()
+        rows.append(
+            [
+                {
+                    "type": "link",
+                    "kind": "detail",
+                    "resource": "User",
+                    "value": user_id,
+                    "id": user_id,
+                    "href": f"/resource/User/detail/{user_id}",
+                },
+                f"user{x}@email.local",
+                x % 3 == 0,
+                x,
+                Decimal(x) / 100,
+                now - timedelta(minutes=x),
+                {"type": "live", "initial": None, "topic": f"user/{x}", "history": False},
+            ]
+        )
+    return {
+        "data": rows,
+        "header": [{"ref": f"col{x}", "display": f"Column {x}", "sortable": True} for x in range(7)],
+        "pagination": {"page": 1, "per_page": ROWS, "total": ROWS * 10, "total_mode": "exact"},
+    }
+
+
+def main():
+    body = list_page_body()
+    custom_encoder = {datetime: lambda dt: dt.strftime(_json.DATETIME_FORMAT)}
+
+    def before():
+        return JSONResponse(content=jsonable_encoder(body, custom_encoder=custom_encoder)).body
+
+    encoders = {"jsonable_encoder": before, "json single pass": lambda: _json._dumps_json(body)}
+    if _json.orjson is not None:
+        encoders["orjson single pass"] = lambda: _json._dumps_orjson(body)
+
+    assert before() == _json._dumps_json(body)
+
+    for name, fn in encoders.items():
+        best = min(timeit.repeat(fn, number=1, repeat=REPEAT))
+        print(f"{name:>18}: {best * 1e6 / ROWS:8.2f} us/row ({best * 1e3:.2f} ms per {ROWS} rows)")
+
+
+if __name__ == "__main__":
+    main()
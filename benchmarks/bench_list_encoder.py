@@ -0,0 +1,139 @@
+#! /usr/bin/env python3
+"""
+Per-row cost of serializing a list page in `resource_list_handler`.
+
+Compares the previous approach (header built per request, one awaited coroutine per cell, copied into
+`benchmarks/baseline_list_encoder.py`) with the list encoder compiled once per view, and reports how much
+of the full handler time is spent on serialization.
+
+    poetry run python -m benchmarks.bench_list_encoder
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Uuid, create_engine
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from starlette.datastructures import URL, ImmutableMultiDict
+
+from admin_table import AdminTable, AdminTableConfig, Resource, ResourceViews
+from admin_table.application import AdminTableRoute
+from admin_table.auth import DummyAuthProvider
+from admin_table.config import Computed, DetailView, LinkDetail, LinkTable, ListView
+from admin_table.modules.sqlalchemy_module import SQLAlchemyResolver
+from benchmarks import baseline_list_encoder
+
+ROWS = 500
+REPEAT = 20
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    email = Column(String)
+    display_name = Column(String)
+    team = Column(String)
+    role = Column(String)
+    is_active = Column(Boolean, default=True)
+    login_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.now)
+    manager_id = Column(Uuid, ForeignKey("users.id"))
+
+
+def best_of(fn) -> float:
+    loop = asyncio.new_event_loop()
+    try:
+        timings = []
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            loop.run_until_complete(fn())
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+    finally:
+        loop.close()
+
+
+def main():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(engine)
+
+    with Session(engine) as session:
+        session.add_all(
+            User(email=f"user{x}@email.local", display_name=f"User {x}", team=f"team {x % 7}", role="member")
+            for x in range(ROWS)
+        )
+        session.commit()
+
+    resolver = SQLAlchemyResolver(session_factory, User)
+    # 12 columns: detail link, 8 plain columns, links to an entity and to a table, one computed column
+    resource = Resource(
+        navigation="Users",
+        name="User",
+        resolver=resolver,
+        views=ResourceViews(
+            list=ListView(
+                fields=[
+                    "email",
+                    "display_name",
+                    "team",
+                    "role",
+                    "is_active",
+                    "login_count",
+                    "created_at",
+                    "manager_id",
+                    ("Manager", LinkDetail("manager_id", "User", "manager_id")),
+                    ("Same team", LinkTable("team", "User", "team", "eq", "team")),
+                    ("Initials", Computed(lambda row: row["display_name"][:2], refs=["display_name"])),
+                ]
+            ),
+            detail=DetailView(fields=["email"]),
+        ),
+    )
+    admin_table = AdminTable(AdminTableConfig(auth_provider=DummyAuthProvider(), resources=[resource]))
+    access_token = admin_table.config.auth_provider.generate_access_token("bench", "bench", ["admin"])
+
+    request = AdminTableRoute.RouteRequest(
+        url=URL("/api/admin/resource/User/list"),
+        path_params={"resource": "User"},
+        query_params=ImmutableMultiDict({"per_page": str(ROWS)}),
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    encoder = admin_table._registry.list_encoders["User"]
+    page = asyncio.run(resolver.resolve_list(resource, 1, ROWS, [], ("email", "asc"), refs=encoder.refs)).list_data
+
+    async def per_cell():
+        return await baseline_list_encoder.encode(resource, resource.views.list, page)
+
+    async def compiled():
+        return await encoder.encode(page, asyncio.Semaphore(16))
+
+    async def resolve():
+        return await resolver.resolve_list(resource, 1, ROWS, [], ("email", "asc"), refs=encoder.refs)
+
+    async def handler():
+        return await admin_table.resource_list_handler(request)
+
+    assert asyncio.run(per_cell()) == asyncio.run(compiled())
+    assert asyncio.run(handler()).status_code == 200
+
+    columns = len(encoder.header)
+    print(f"{ROWS} rows x {columns} columns")
+    for name, fn in (("per-cell await", per_cell), ("compiled encoder", compiled)):
+        best = best_of(fn)
+        print(f"{name:>18}: {best * 1e6 / ROWS:8.2f} us/row ({best * 1e3:.2f} ms per page)")
+
+    handler_time, resolve_time = best_of(handler), best_of(resolve)
+    print(f"{'handler':>18}: {handler_time * 1e6 / ROWS:8.2f} us/row ({handler_time * 1e3:.2f} ms per page)")
+    print(f"{'of which resolver':>18}: {resolve_time * 1e6 / ROWS:8.2f} us/row ({resolve_time * 1e3:.2f} ms per page)")
+
+
+if __name__ == "__main__":
+    main()
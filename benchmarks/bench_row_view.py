@@ -0,0 +1,85 @@
+#! /usr/bin/env python3
+"""
+Per-row cost of turning a fetched result row into the entity passed to the views and user callbacks.
+
+Compares the previous approach (dynamic subclass of the model created for every row)
+with `ResolvedRow` generated once per resource.
+
+    poetry run python -m benchmarks.bench_row_view
+"""
+
+import timeit
+import uuid
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Boolean, Column, DateTime, String, Uuid, create_engine, select
+from sqlalchemy.orm import DeclarativeBase, Session
+
+from admin_table.modules.bases import ResolvedRow
+
+ROWS = 500
+REPEAT = 20
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    email = Column(String)
+    hashed_password = Column(String)
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime, default=datetime.now)
+
+
+def model_overwrite_entity(entry: Any, keys: list[str]) -> Any:
+    """Entity creation as done before `ResolvedRow`"""
+    obj = {key: value for value, key in zip(entry, keys)}
+
+    class ModelOverwrite(User):
+        __abstract__ = True
+
+        def __getitem__(self, item):
+            return obj[item]
+
+        def get(self, *args, **kwargs):
+            return obj.get(*args, **kwargs)
+
+    return ModelOverwrite(**{k: v for k, v in obj.items() if k in dir(User)})
+
+
+def main():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        session.add_all(User(email=f"user{x}@email.local", hashed_password="x" * 32) for x in range(ROWS))
+        session.commit()
+
+        columns = [User.id, User.email, User.hashed_password, User.is_active, User.created_at]
+        keys = [c.key for c in columns]
+        rows = session.execute(select(*columns)).fetchall()
+
+    row_type = ResolvedRow.make_type("UserRow", keys)
+
+    def before():
+        for row in rows:
+            entity = model_overwrite_entity(row, keys)
+            entity["email"], entity.email
+
+    def after():
+        for row in rows:
+            entity = row_type(row)
+            entity["email"], entity.email
+
+    for name, fn in (("model overwrite", before), ("resolved row", after)):
+        best = min(timeit.repeat(fn, number=1, repeat=REPEAT))
+        print(f"{name:>16}: {best * 1e6 / ROWS:8.2f} us/row ({best * 1e3:.2f} ms per {ROWS} rows)")
+
+
+if __name__ == "__main__":
+    main()
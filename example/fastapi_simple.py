@@ -14,7 +14,7 @@ import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import Field, create_model
-from sqlalchemy import func, literal
+from sqlalchemy import func, literal, select
 from sqlalchemy.orm import Query, make_transient, make_transient_to_detached
 from starlette import status
 from starlette.responses import RedirectResponse
@@ -23,6 +23,8 @@ from typing_extensions import Doc
 from admin_table import AdminTable, AdminTableConfig, Resource, ResourceViews
 from admin_table.auth import DummyAuthProvider
 from admin_table.config import (
+    Computed,
+    ComputedBatch,
     CreateView,
     DetailView,
     InputForm,
@@ -60,11 +62,10 @@ async def another_action(user: User, bool_param: bool) -> RedirectList:
     Performs various actions on the user :wink:
     Try to pass "hello" into the `string_param` and see what happens
     """
-    with SessionLocal() as ss:
-        ss.add(user)
-        return RedirectList(
-            resource="Items", filters=[SQLAlchemyResolver.AppliedFilter("id", "eq", str(user.items[-1].id))]
-        )
+    # resolved entry is a plain row, relationships have to be loaded explicitly
+    async with SessionLocal() as ss:
+        last_item = await ss.scalar(select(Item).filter(Item.owner_id == user.id).order_by(Item.id.desc()).limit(1))
+        return RedirectList(resource="Items", filters=[SQLAlchemyResolver.AppliedFilter("id", "eq", str(last_item.id))])
 
 
 def hello(user: User, b1: bool, b2: bool, string1: str, string2: str, string3: str) -> str:
@@ -111,6 +112,11 @@ async def random_graph_data(
     )
 
 
+async def item_title_lengths(rows) -> list[int]:
+    # batch computed columns receive the whole page, so a remote lookup can be done in a single call
+    return [len(row["title"]) for row in rows]
+
+
 def generate_item_list_description() -> str:
     return (
         '## Some really cool graph\n'
@@ -224,7 +230,8 @@ config = AdminTableConfig(
                         (
                             "[[json]]JSON Field",
                             "This field will show formated JSON data",
-                            lambda d: '{"key": "value", "key2": "value2", "sub": {"key": "value"}}',
+                            # no refs are declared, so the list does not have to select all columns
+                            Computed(lambda d: '{"key": "value", "key2": "value2", "sub": {"key": "value"}}', refs=[]),
                         ),
                     ],
                 ),
@@ -310,6 +317,7 @@ config = AdminTableConfig(
                         Item.title,
                         ("Is Public", Item.public),
                         ("Description", Item.description),
+                        ("Title length", ComputedBatch(item_title_lengths, refs=["title"])),
                         ("Owner", LinkDetail("owner_email", "User", "owner_id")),
                     ],
                 ),
@@ -0,0 +1,55 @@
+import asyncio
+
+from admin_table import AdminTable, AdminTableConfig
+from admin_table.application import URL, AdminTableRoute
+from admin_table.assets import AssetStore, accepts_encoding
+from admin_table.auth import DummyAuthProvider
+
+
+def test_accepts_encoding():
+    assert accepts_encoding("gzip, deflate, br", "gzip")
+    assert accepts_encoding("br, gzip;q=0.5", "gzip")
+    assert accepts_encoding("*", "gzip")
+    assert not accepts_encoding("gzip;q=0", "gzip")
+    assert not accepts_encoding("gzip; q=0.000, *", "gzip")
+    assert not accepts_encoding("*;q=0", "gzip")
+    assert not accepts_encoding("identity", "gzip")
+    assert not accepts_encoding("", "gzip")
+
+
+def test_gzip_representation_has_its_own_etag(tmp_path):
+    (tmp_path / "index.html").write_text("<html>" + "x" * 4096 + "</html>")
+    admin_table = AdminTable(AdminTableConfig(auth_provider=DummyAuthProvider()))
+    admin_table._assets = AssetStore(str(tmp_path))
+
+    def get(headers: dict[str, str]) -> AdminTableRoute.RouteResponse:
+        request = AdminTableRoute.RouteRequest(
+            url=URL(scheme="http", host="localhost", port=None, path="/", query=""),
+            path_params={"path": "index.html"},
+            headers=headers,
+        )
+        return asyncio.run(admin_table.default_handler(request))
+
+    gzipped = get({"accept-encoding": "gzip"})
+    identity = get({"accept-encoding": "gzip;q=0"})
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in identity.headers
+    assert gzipped.headers["ETag"] != identity.headers["ETag"]
+
+    # validator of one representation does not match the other one
+    assert get({"accept-encoding": "gzip", "if-none-match": identity.headers["ETag"]}).status_code == 200
+    not_modified = get({"accept-encoding": "gzip", "if-none-match": gzipped.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["Vary"] == "Accept-Encoding"
+    assert not_modified.headers["ETag"] == gzipped.headers["ETag"]
+
+
+def test_missing_ui_is_not_found(tmp_path):
+    admin_table = AdminTable(AdminTableConfig(auth_provider=DummyAuthProvider()))
+    admin_table._assets = AssetStore(str(tmp_path / "ui"))
+    request = AdminTableRoute.RouteRequest(
+        url=URL(scheme="http", host="localhost", port=None, path="/", query=""),
+        path_params={"path": "resource/User/list"},
+    )
+
+    assert asyncio.run(admin_table.default_handler(request)).status_code == 404
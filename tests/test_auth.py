@@ -0,0 +1,43 @@
+import json
+import os
+
+import pytest
+
+from admin_table.auth import DummyAuthProvider, InvalidAccessTokenException
+from admin_table.keyring import Keyring
+
+
+def write_keyring(path, keys: dict[str, str], current: str, mtime: int) -> None:
+    path.write_text(json.dumps({"current": current, "keys": keys}))
+    # reload is triggered by the modification time, which may not change between quick writes
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_cached_access_token_is_immutable():
+    auth_provider = DummyAuthProvider()
+    token = auth_provider.generate_access_token(user_id="user", display="user", capabilities=["admin"])
+
+    auth_provider.decode_access_token(token)
+    decoded = auth_provider.decode_access_token(token)
+    with pytest.raises(AttributeError):
+        decoded.capabilities.append("root")  # type: ignore[attr-defined]
+
+    assert auth_provider.access_token_cache.info()["hits"] == 1
+    assert auth_provider.decode_access_token(token).capabilities == ("admin",)
+
+
+def test_cached_access_token_rejected_after_key_removal(tmp_path):
+    path = tmp_path / "keys.json"
+    write_keyring(path, {"old": "old secret", "new": "new secret"}, "old", 1)
+    auth_provider = DummyAuthProvider()
+    auth_provider.keyring = Keyring.from_file(str(path))
+    token = auth_provider.generate_access_token(user_id="user", display="user", capabilities=["admin"])
+    auth_provider.decode_access_token(token)
+
+    # rotation switches current key first, tokens of the old key stay valid
+    write_keyring(path, {"old": "old secret", "new": "new secret"}, "new", 2)
+    assert auth_provider.decode_access_token(token).user_id == "user"
+
+    write_keyring(path, {"new": "new secret"}, "new", 3)
+    with pytest.raises(InvalidAccessTokenException):
+        auth_provider.decode_access_token(token)
@@ -0,0 +1,68 @@
+import json
+import os
+from datetime import timedelta
+
+import pytest
+
+from admin_table.keyring import Keyring, RotatingKeyring
+
+
+def test_parse_keyring_json_or_single_secret():
+    assert Keyring._parse(json.dumps({"current": "b", "keys": {"a": "1", "b": "2"}})) == ({"a": "1", "b": "2"}, "b")
+    assert Keyring._parse(" secret\n") == ({"default": "secret"}, "default")
+
+
+@pytest.mark.parametrize(
+    "data, message",
+    [
+        ({"keys": {"a": "1"}}, "'current'"),
+        ({"current": "a"}, "'keys'"),
+        ({"current": "a", "keys": ["1"]}, "'keys'"),
+        ({"current": "b", "keys": {"a": "1"}}, "Current key b"),
+    ],
+)
+def test_invalid_keyring(monkeypatch, data, message):
+    monkeypatch.setenv("ADMIN_TABLE_SIGN_KEYS", json.dumps(data))
+    with pytest.raises(ValueError, match=message):
+        Keyring.from_env()
+
+
+def test_file_keyring_reloads_on_change(tmp_path):
+    path = tmp_path / "keys.json"
+    path.write_text(json.dumps({"current": "a", "keys": {"a": "1"}}))
+    os.utime(path, ns=(1, 1))
+    keyring = Keyring.from_file(str(path))
+    assert keyring.current() == ("a", "1")
+
+    path.write_text(json.dumps({"current": "b", "keys": {"a": "1", "b": "2"}}))
+    os.utime(path, ns=(2, 2))
+    assert keyring.current() == ("b", "2")
+    assert keyring.get("a") == "1"
+
+    path.write_text(json.dumps({"current": "b", "keys": {"b": "2"}}))
+    os.utime(path, ns=(3, 3))
+    assert keyring.get("a") is None
+
+
+def test_rotating_keyring(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("admin_table.keyring.time.time", lambda: now[0])
+    keyring = RotatingKeyring("master", rotate_every=timedelta(seconds=100), overlap=1)
+    other_process = RotatingKeyring("master", rotate_every=timedelta(seconds=100), overlap=1)
+
+    kid, key = keyring.current()
+    assert kid == "r10"
+    assert other_process.get(kid) == key
+    assert RotatingKeyring("other master").get(kid) != key
+
+    # retired key verifies for `overlap` periods, then it is rejected
+    now[0] = 1100.0
+    assert keyring.current()[0] == "r11"
+    assert keyring.get(kid) == key
+    now[0] = 1200.0
+    assert keyring.get(kid) is None
+
+    # one period ahead is accepted because of clock differences, further ones and malformed kids are not
+    assert keyring.get("r13") is not None
+    assert keyring.get("r14") is None
+    assert keyring.get("default") is None
@@ -0,0 +1,240 @@
+import asyncio
+import json
+import os
+import stat
+
+from starlette.datastructures import ImmutableMultiDict
+
+from admin_table import AdminTable, AdminTableConfig
+from admin_table.application import URL, AdminTableWebsocket
+from admin_table.auth import DummyAuthProvider
+from admin_table.config import LiveDataManagerBase, SharedLiveDataManagerBase
+from admin_table.live_data_broker import LiveDataBroker
+from admin_table.shared_live_data import SharedLiveDataDispatcher
+
+
+class Counter(LiveDataManagerBase):
+    def __init__(self, topic: str):
+        super().__init__(topic)
+
+    async def __aenter__(self):
+        return self.produce()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+    async def produce(self):
+        i = 0
+        while True:
+            await asyncio.sleep(0.01)
+            i += 1
+            yield self.DataEvent(value=str(i))
+
+
+def make_admin_table() -> AdminTable:
+    return AdminTable(AdminTableConfig(resources=[], auth_provider=DummyAuthProvider(), live_data_manager=Counter))
+
+
+def make_ws(path: str = "/ws/live_data", topic: str | None = None, send_text=None):
+    inbox: asyncio.Queue = asyncio.Queue()
+    sent: list = []
+
+    async def append(frame):
+        sent.append(frame)
+
+    async def noop(*args, **kwargs):
+        pass
+
+    ws = AdminTableWebsocket.Websocket(
+        url=URL(scheme="ws", host="localhost", port=None, path=path, query=""),
+        path_params={},
+        query_params=ImmutableMultiDict({"topic": topic} if topic else {}),
+        headers={},
+        cookies={},
+        accept=noop,
+        receive_json=inbox.get,
+        send_json=append,
+        send_text=send_text or append,
+        send_bytes=noop,
+        close=noop,
+    )
+    return ws, inbox, sent
+
+
+def test_failed_writer_disconnects_client(capsys):
+    async def broken(frame):
+        raise ConnectionResetError("gone")
+
+    async def run():
+        admin_table = make_admin_table()
+        ws, _, _ = make_ws(topic="counter", send_text=broken)
+        handler = asyncio.create_task(admin_table.live_data_websocket_handler(ws))
+        await asyncio.sleep(0.1)
+        metrics = admin_table.live_data_metrics()["counter"]
+        handler.cancel()
+        await asyncio.gather(handler, return_exceptions=True)
+        return metrics
+
+    metrics = asyncio.run(run())
+
+    assert metrics["subscribers"] == 0
+    assert metrics["disconnected"] == 1
+    assert "ConnectionResetError('gone')" in capsys.readouterr().err
+
+
+def test_multiplex_rejects_invalid_messages():
+    async def run():
+        admin_table = make_admin_table()
+        ws, inbox, sent = make_ws(path="/ws/live_data/multiplex")
+        handler = asyncio.create_task(admin_table.live_data_multiplex_handler(ws))
+        for msg in (
+            ["bad"],
+            "bad",
+            {"action": "publish", "topics": ["counter"]},
+            {"action": "subscribe", "topics": "counter"},
+            {"action": "subscribe", "topics": ["counter"], "resume": {"counter": 1}},
+            {"action": "subscribe", "topics": ["counter"]},
+        ):
+            await inbox.put(msg)
+        await asyncio.sleep(0.05)
+        handler.cancel()
+        await asyncio.gather(handler, return_exceptions=True)
+        return sent
+
+    sent = asyncio.run(run())
+
+    errors = [frame for frame in sent if isinstance(frame, dict)]
+    assert len(errors) == 5
+    assert all(error["error"].startswith("Invalid message") for error in errors)
+    # connection survives invalid messages, the valid subscription afterwards receives events
+    assert any(isinstance(frame, str) and '"topic":"counter"' in frame for frame in sent)
+
+
+def test_coalesced_value_is_flushed_on_teardown():
+    class Finite(Counter):
+        max_rate = 1
+
+        async def produce(self):
+            for i in range(3):
+                yield self.DataEvent(value=str(i))
+
+    class Endless(Counter):
+        max_rate = 1
+
+    async def run(manager, stop):
+        admin_table = make_admin_table()
+        admin_table.config.live_data_manager = manager
+        ws, _, _ = make_ws(topic="counter")
+        handler = asyncio.create_task(admin_table.live_data_websocket_handler(ws))
+        await asyncio.sleep(0)
+        task = admin_table._subscriber_info["counter"]["task"]
+        await asyncio.sleep(0.1)
+        if stop:
+            task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        handler.cancel()
+        await asyncio.gather(handler, return_exceptions=True)
+        return admin_table._live_data_history["counter"].since()
+
+    # producer ended, or topic was stopped before the first flush of at most one frame per second
+    assert [value for _, value in asyncio.run(run(Finite, stop=False))] == ["2"]
+    assert len(asyncio.run(run(Endless, stop=True))) == 1
+
+
+def test_idle_producer_stops_after_linger():
+    class Silent(Counter):
+        linger = 0.05
+
+        async def produce(self):
+            await asyncio.Event().wait()
+            yield self.DataEvent(value="never")
+
+    async def run():
+        admin_table = make_admin_table()
+        admin_table.config.live_data_manager = Silent
+        ws, _, _ = make_ws(topic="silent")
+        handler = asyncio.create_task(admin_table.live_data_websocket_handler(ws))
+        await asyncio.sleep(0.01)
+        await admin_table.live_data_websocket_disconnect(ws)
+        handler.cancel()
+        lingering = admin_table.live_data_producer_metrics()
+        await asyncio.sleep(0.1)
+        return lingering, admin_table.live_data_producer_metrics()
+
+    lingering, stopped = asyncio.run(run())
+
+    # producer which yields nothing is stopped once the linger period passes
+    assert (lingering["running"], lingering["lingering"], lingering["stopped"]) == (1, 1, 0)
+    assert (stopped["running"], stopped["stopped"]) == (0, 1)
+
+
+def test_shared_topic_overflow_is_counted():
+    class Upstream(SharedLiveDataManagerBase):
+        queue_size = 3
+
+        async def __aenter__(self):
+            raise NotImplementedError()
+
+        async def __aexit__(self, exc_type, exc_val, exc_tb):
+            return None
+
+    def put_all(upstream, count):
+        producer = SharedLiveDataDispatcher(upstream).topic("topic")
+        for i in range(count):
+            producer.put(SharedLiveDataManagerBase.DataEvent(topic="topic", value=str(i)))
+        return [event.value for event in producer._events], producer.stats.upstream_dropped
+
+    async def run():
+        upstream = Upstream()
+        oldest = put_all(upstream, 5)
+        upstream.overflow = "keep_latest"
+        latest = put_all(upstream, 5)
+        return oldest, latest
+
+    oldest, latest = asyncio.run(run())
+
+    assert oldest == (["2", "3", "4"], 2)
+    assert latest == (["3", "4"], 3)
+
+
+def test_broker_socket_is_private(tmp_path):
+    path = str(tmp_path / "live_data.sock")
+
+    async def run():
+        await LiveDataBroker(Counter, path).start()
+        return stat.S_IMODE(os.stat(path).st_mode)
+
+    assert asyncio.run(run()) == 0o600
+
+
+def test_multiplex_topic_end_keeps_other_topics():
+    class Mixed(Counter):
+        async def produce(self):
+            async for event in super().produce():
+                if self.topic == "short" and event.value == "3":
+                    return
+                yield event
+
+    async def run():
+        admin_table = make_admin_table()
+        admin_table.config.live_data_manager = Mixed
+        ws, inbox, sent = make_ws(path="/ws/live_data/multiplex")
+        handler = asyncio.create_task(admin_table.live_data_multiplex_handler(ws))
+        await inbox.put({"action": "subscribe", "topics": ["short", "long"]})
+        await asyncio.sleep(0.2)
+        metrics = admin_table.live_data_metrics()
+        # ended topic can be subscribed again on the same connection
+        await inbox.put({"action": "subscribe", "topics": ["short"]})
+        await asyncio.sleep(0.02)
+        resubscribed = admin_table.live_data_metrics()
+        handler.cancel()
+        await asyncio.gather(handler, return_exceptions=True)
+        return sent, metrics, resubscribed
+
+    sent, metrics, resubscribed = asyncio.run(run())
+
+    frames = [json.loads(frame) for frame in sent if isinstance(frame, str)]
+    assert {"topic": "short", "end": True} in frames
+    assert sum(frame["topic"] == "long" and "value" in frame for frame in frames) > 10
+    assert list(metrics) == ["long"] and metrics["long"]["subscribers"] == 1
+    assert resubscribed["short"]["subscribers"] == 1
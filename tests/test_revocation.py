@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from admin_table.revocation import BloomFilter, MemoryRevocationStore, SQLiteRevocationStore
+
+
+def expiry(seconds: float) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000)
+    items = [f"token-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_memory_store_prunes_expired():
+    async def run():
+        store = MemoryRevocationStore()
+        await store.revoke("expired", expiry(-1))
+        await store.revoke("valid", expiry(60))
+        return store, await store.is_revoked("valid"), await store.is_revoked("other")
+
+    store, valid, other = asyncio.run(run())
+
+    assert (valid, other) == (True, False)
+    # expired entry is pruned by the next revocation
+    assert "expired" not in store._revoked
+
+
+@pytest.fixture
+def sqlite_stores(tmp_path):
+    # two stores over one file act like two worker processes
+    path = str(tmp_path / "revoked.sqlite")
+    stores = [SQLiteRevocationStore(path, capacity=4) for _ in range(2)]
+    yield stores
+    for store in stores:
+        store.close()
+
+
+def test_sqlite_revocation_visible_to_other_store(sqlite_stores):
+    first, second = sqlite_stores
+
+    async def run():
+        before = await second.is_revoked("token")
+        await first.revoke("token", expiry(60))
+        return before, await second.is_revoked("token"), await second.is_revoked("other")
+
+    assert asyncio.run(run()) == (False, True, False)
+
+
+def test_sqlite_unchanged_database_is_not_queried(sqlite_stores):
+    first, second = sqlite_stores
+
+    async def run():
+        await first.revoke("token", expiry(60))
+        await second.is_revoked("token")
+        synced = second._last_id
+        # counter of the file did not change, the filter is not synced again
+        second._last_id = -1
+        await second.is_revoked("other")
+        return synced, second._last_id
+
+    assert asyncio.run(run()) == (1, -1)
+
+
+def test_sqlite_full_bloom_filter_is_rebuilt(sqlite_stores):
+    first, second = sqlite_stores
+
+    async def run():
+        for i in range(6):
+            await first.revoke(f"expired-{i}", expiry(-1))
+        for i in range(6):
+            await first.revoke(f"token-{i}", expiry(60))
+        return [await second.is_revoked(f"token-{i}") for i in range(6)], await second.is_revoked("expired-0")
+
+    revoked, expired = asyncio.run(run())
+
+    assert all(revoked)
+    assert not expired
+    # rebuilt filter holds only the entries which did not expire
+    assert second._bloom.count == 6
@@ -0,0 +1,136 @@
+import asyncio
+import base64
+import json
+
+import pytest
+from sqlalchemy import Integer, String, create_engine, func
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
+from starlette.datastructures import ImmutableMultiDict
+
+from admin_table import AdminTable, AdminTableConfig, Resource, ResourceViews
+from admin_table.application import URL, AdminTableRoute
+from admin_table.auth import DummyAuthProvider
+from admin_table.config import ListView
+from admin_table.modules import SQLAlchemyResolver
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Entry(Base):
+    __tablename__ = "entry"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str | None] = mapped_column(String, nullable=True)
+
+
+def make_resource(**resolver_kwargs) -> Resource:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session_maker = sessionmaker(engine)
+    with session_maker() as session:
+        # every third entry has no name
+        session.add_all(Entry(id=i, name=None if i % 3 == 0 else f"name{i % 4}") for i in range(1, 21))
+        session.commit()
+
+    resolver = SQLAlchemyResolver(session_maker, Entry, **resolver_kwargs)
+    resource = Resource(
+        name="Entry", navigation=None, views=ResourceViews(list=ListView(fields=[("Id", "id")])), resolver=resolver
+    )
+    resolver.bind(resource)
+    return resource
+
+
+async def walk_cursor(resource: Resource, sort) -> tuple[list[int], list[int]]:
+    """Ids of all pages traversed forward, and of all pages traversed backward from the last one"""
+    resolver = resource.resolver
+    forward: list[int] = []
+    cursor = None
+    while True:
+        page = await resolver.resolve_list(resource, 1, 3, [], sort, pagination="cursor", cursor=cursor)
+        forward += [row["id"] for row in page.list_data]
+        if not page.pagination["next_cursor"]:
+            break
+        cursor = page.pagination["next_cursor"]
+
+    backward = [row["id"] for row in page.list_data]
+    cursor = page.pagination["prev_cursor"]
+    while cursor:
+        page = await resolver.resolve_list(resource, 1, 3, [], sort, pagination="cursor", cursor=cursor)
+        backward = [row["id"] for row in page.list_data] + backward
+        cursor = page.pagination["prev_cursor"]
+    return forward, backward
+
+
+def test_cursor_pagination_nullable_sort_column():
+    resource = make_resource()
+    for direction in ("asc", "desc"):
+        forward, backward = asyncio.run(walk_cursor(resource, ("name", direction)))
+
+        assert sorted(forward) == list(range(1, 21))
+        assert backward == forward
+        # entries without a name are at the end, ordered by id in the same direction
+        nameless = [3, 6, 9, 12, 15, 18]
+        assert forward[-6:] == (nameless if direction == "asc" else nameless[::-1])
+
+
+def test_late_extra_cols_replacing_model_column():
+    extra_cols = {"name": func.upper(Entry.name), "name_length": func.length(Entry.name)}
+    late = make_resource(extra_cols=extra_cols)
+    single = make_resource(extra_cols=extra_cols, late_extra_cols=False)
+
+    for strategy in ("exact", "window"):
+        args = (2, 5, [], ("id", "asc"))
+        late_rows = asyncio.run(late.resolver.resolve_list(late, *args, count_strategy=strategy)).list_data
+        single_rows = asyncio.run(single.resolver.resolve_list(single, *args, count_strategy=strategy)).list_data
+
+        assert [list(row.items()) for row in late_rows] == [list(row.items()) for row in single_rows]
+        assert [(row["id"], row["name"], row["name_length"]) for row in late_rows[:2]] == [
+            (6, None, None),
+            (7, "NAME3", 5),
+        ]
+
+
+def list_request(admin_table: AdminTable, cursor: str) -> AdminTableRoute.RouteResponse:
+    access_token = admin_table.config.auth_provider.generate_access_token(
+        user_id="user", display="user", capabilities=["admin"]
+    )
+    request = AdminTableRoute.RouteRequest(
+        url=URL(scheme="http", host="localhost", port=None, path="/resource/Entry/list", query=""),
+        path_params={"resource": "Entry"},
+        query_params=ImmutableMultiDict({"cursor": cursor}),
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    return asyncio.run(admin_table.resource_list_handler(request))
+
+
+def encode_payload(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        # wrong number of values
+        encode_payload({"s": ["name", "asc"], "d": "next", "v": ["name1"]}),
+        encode_payload({"s": ["name", "asc"], "d": "next", "v": "ab"}),
+        # values which cannot be decoded
+        encode_payload({"s": ["name", "asc"], "d": "next", "v": [{"dec": "abc"}, 1]}),
+        encode_payload({"s": ["name", "asc"], "d": "next", "v": [["name1"], 1]}),
+    ],
+)
+def test_invalid_cursor_is_bad_request(cursor):
+    resource = make_resource()
+    resource.views.list.pagination = "cursor"
+    admin_table = AdminTable(AdminTableConfig(resources=[resource], auth_provider=DummyAuthProvider()))
+
+    assert list_request(admin_table, cursor).status_code == 400
+
+
+def test_cursor_is_ignored_by_offset_pagination():
+    resource = make_resource()
+    admin_table = AdminTable(AdminTableConfig(resources=[resource], auth_provider=DummyAuthProvider()))
+
+    assert list_request(admin_table, "not a cursor").status_code == 200